@@ -0,0 +1,148 @@
+"""Columnar in-memory view of contributions for vectorized analytics.
+
+Each field lives in its own compact ``array`` column. Repeated strings
+(language, type, quality, ...) are stored as integer codes into a category
+table and timestamps as int64 nanoseconds, so a million records take a
+few tens of megabytes instead of a list of dicts.
+"""
+import threading
+from array import array
+from datetime import datetime
+
+import numpy as np
+
+EPOCH = datetime(1970, 1, 1)
+
+# Categorical columns and how to read them from a contribution
+CATEGORICAL_FIELDS = {
+    "type": lambda c, language: c.get("type"),
+    "language": lambda c, language: language,
+    "contributor": lambda c, language: c.get("contributor"),
+    "team": lambda c, language: c.get("team"),
+    # Audio, text and video forms each name their sub-category differently
+    "detail": lambda c, language: c.get("category") or c.get("text_type") or c.get("video_type"),
+    "quality": lambda c, language: c.get("quality"),
+    "region": lambda c, language: c.get("region"),
+    "difficulty": lambda c, language: c.get("difficulty"),
+}
+
+
+def timestamp_ns(timestamp):
+    delta = datetime.fromisoformat(timestamp).replace(tzinfo=None) - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+
+class Categories:
+    """Interns strings to stable integer codes (-1 for missing)."""
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def code(self, value):
+        if value is None or value == "":
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value):
+        return self._codes.get(value, -2)
+
+
+class ContributionFrame:
+    """Append-only columnar store kept current through store listeners."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.seq = array("q")
+        self.timestamp = array("q")
+        self.hours = array("d")
+        self.words = array("i")
+        self.codes = {name: array("i") for name in CATEGORICAL_FIELDS}
+        self.categories = {name: Categories() for name in CATEGORICAL_FIELDS}
+
+    @classmethod
+    def from_store(cls, store):
+        frame = cls()
+        store.follow(frame.append_entries)
+        return frame
+
+    def __len__(self):
+        return len(self.seq)
+
+    def append_entries(self, entries):
+        with self._lock:
+            self._append(entries)
+
+    def _append(self, entries):
+        for seq, language, contribution in entries:
+            self.seq.append(seq)
+            self.timestamp.append(timestamp_ns(contribution["timestamp"]))
+            self.hours.append(float(contribution.get("duration_hours") or 0))
+            self.words.append(int(contribution.get("word_count") or 0))
+            for name, field in CATEGORICAL_FIELDS.items():
+                self.codes[name].append(self.categories[name].code(field(contribution, language)))
+
+    def _column(self, column, n):
+        return np.frombuffer(column, dtype=np.dtype(column.typecode))[:n]
+
+    def mask(self, n=None, **filters):
+        """Boolean row mask for equality filters on categorical columns."""
+        n = len(self) if n is None else n
+        mask = np.ones(n, dtype=bool)
+        for name, value in filters.items():
+            if value is None:
+                continue
+            codes = self._column(self.codes[name], n)
+            if isinstance(value, (list, tuple, set)):
+                wanted = [self.categories[name].lookup(v) for v in value]
+                mask &= np.isin(codes, wanted)
+            else:
+                mask &= codes == self.categories[name].lookup(value)
+        return mask
+
+    def to_pandas(self, **filters):
+        """Materialize (optionally filtered) rows as a DataFrame.
+
+        Categorical columns come back as ``pd.Categorical`` built straight
+        from the stored codes, timestamps as ``datetime64[ns]``.
+        """
+        # Imported here so pages that never materialize a frame don't load pandas
+        import pandas as pd
+
+        with self._lock:
+            n = len(self)
+            mask = self.mask(n, **filters)
+            columns = {
+                "seq": self._column(self.seq, n)[mask],
+                "timestamp": self._column(self.timestamp, n)[mask].view("datetime64[ns]"),
+                "hours": self._column(self.hours, n)[mask],
+                "words": self._column(self.words, n)[mask],
+            }
+            for name in CATEGORICAL_FIELDS:
+                columns[name] = pd.Categorical.from_codes(
+                    self._column(self.codes[name], n)[mask],
+                    categories=list(self.categories[name].values),
+                )
+        return pd.DataFrame(columns)
+
+    def distinct_counts(self, by, of, **filters):
+        """Number of distinct ``of`` values per ``by`` value, e.g. teams per language.
+
+        Rows missing either value are left out.
+        """
+        with self._lock:
+            n = len(self)
+            mask = self.mask(n, **filters)
+            keys = self._column(self.codes[by], n)[mask].astype(np.int64)
+            values = self._column(self.codes[of], n)[mask].astype(np.int64)
+            names = list(self.categories[by].values)
+            width = len(self.categories[of].values)
+        present = (keys >= 0) & (values >= 0)
+        # Pack each (by, of) code pair into one integer so a single unique() dedupes them
+        pairs = np.unique(keys[present] * width + values[present])
+        codes, counts = np.unique(pairs // max(width, 1), return_counts=True)
+        return {names[code]: int(count) for code, count in zip(codes, counts)}
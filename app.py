@@ -1,12 +1,43 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import time
+import atexit
+from datetime import date, datetime, timedelta
 import random
 import uuid
-import json
+import csv
+import hashlib
+import multiprocessing
+import os
+import tracemalloc
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from analytics import ContributionFrame
+from audio import audio_processor
+from blobs import BlobStore
+from catalog import (
+    AUDIO_CATEGORIES, AUDIO_DURATIONS, AUDIO_PROMPTS, AUDIO_QUALITIES, DIFFICULTIES, IMAGE_CATEGORIES,
+    LANGUAGE_LABELS, LANGUAGE_NAMES, LANGUAGES, REGIONS, SOURCE_LANGUAGES, TEXT_TYPES, VIDEO_DURATIONS,
+    VIDEO_PROMPTS, VIDEO_SETTINGS, VIDEO_TYPES,
+)
+from dedupe import MinHashIndex, drop_near_duplicates
+from exporter import (DEDUPE_FIELDS, EXPORT_COLUMNS, ESSENTIAL_COLUMNS, EXPORT_DIR, EXPORT_FORMATS,
+                      ExportView, anonymize, hash_ids, write_export)
+from figcache import FigureCache
+from bulk_import import MIN_DESCRIPTION_LENGTH, MIN_TEXT_LENGTH, import_file
+from ingest import DONE, FAILED, IngestPool, IngestQueueFull, media_processor
+from journal import Journal
+from leaderboard import TeamLeaderboard
+from profiling import profiled, profiler, timed
+from rollups import EMPTY
+from shards import MANIFEST, MEDIA_FIELDS, SHARD_BYTES, SHARD_RECORDS, write_shards
+from store import contribution_language, open_store
+from textstats import check_scripts, dominant_script, text_stats
+from timeseries import EMPTY_BUCKET
+from writequeue import WriteQueue, WriteQueueFull, WriteTimeout
+
+# pandas and plotly are imported inside the functions that build tables and
+# charts, so a cold start of a page that draws neither never loads them
 
 # Page configuration
 st.set_page_config(
@@ -16,34 +47,104 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+DEFAULT_TEAM = "Independent"
+
 # Initialize session state
 if 'current_page' not in st.session_state:
     st.session_state.current_page = "home"
-if 'contributions' not in st.session_state:
-    st.session_state.contributions = []
-if 'audio_hours' not in st.session_state:
-    st.session_state.audio_hours = 0
-if 'video_hours' not in st.session_state:
-    st.session_state.video_hours = 0
-if 'text_records' not in st.session_state:
-    st.session_state.text_records = 0
-if 'image_records' not in st.session_state:
-    st.session_state.image_records = 0
-if 'user_name' not in st.session_state:
-    st.session_state.user_name = "Language Contributor"
-
-# Language data
-LANGUAGES = {
-    "Hindi": {"name": "हिन्दी", "contributors": 156, "hours": 234.5},
-    "Tamil": {"name": "தமிழ்", "contributors": 143, "hours": 198.2},
-    "Telugu": {"name": "తెలుగు", "contributors": 98, "hours": 167.8},
-    "Bengali": {"name": "বাংলা", "contributors": 87, "hours": 145.3},
-    "Marathi": {"name": "मराठी", "contributors": 76, "hours": 134.7},
-    "Gujarati": {"name": "ગુજરાતી", "contributors": 65, "hours": 112.4},
-    "Kannada": {"name": "ಕನ್ನಡ", "contributors": 54, "hours": 98.6},
-    "Malayalam": {"name": "മലയാളം", "contributors": 43, "hours": 87.3},
-    "English": {"name": "English", "contributors": 57, "hours": 60}
-}
+if 'ingest_jobs' not in st.session_state:
+    st.session_state.ingest_jobs = []
+if 'team_name' not in st.session_state:
+    st.session_state.team_name = DEFAULT_TEAM
+
+@st.cache_resource
+def get_store():
+    # One store per server process, shared by every session
+    return open_store()
+
+@st.cache_resource
+def get_blob_store():
+    return BlobStore(os.environ.get("BHASHA_BLOB_DIR", os.path.join("data", "blobs")))
+
+@st.cache_resource
+def get_write_queue():
+    # Every session's inserts are group-committed by one writer thread
+    return WriteQueue(get_store())
+
+@st.cache_resource
+def get_journal():
+    return Journal(os.environ.get("BHASHA_JOURNAL_DIR", os.path.join("data", "journal")))
+
+@st.cache_resource
+def get_ingest_pool():
+    # Shared by all sessions so concurrent submissions share one bounded queue
+    pool = IngestPool(get_write_queue(), journal=get_journal())
+    # Let running jobs commit on the way out; anything cut short stays journaled
+    atexit.register(pool.shutdown)
+    # Pick up recordings that were still processing when the server stopped
+    pool.resume(ingest_processor)
+    return pool
+
+@st.cache_resource
+def get_audio_pool():
+    # Recording analysis is CPU bound; spawned workers keep it off the script threads
+    return ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache(maxsize=256)
+
+@st.cache_resource
+def get_leaderboard():
+    return TeamLeaderboard.from_store(get_store())
+
+@st.cache_resource
+def get_dedupe_index():
+    return MinHashIndex.from_store(get_store())
+
+@st.cache_resource
+def get_frame():
+    # Columnar analytics view, kept current by the store on every insert
+    return ContributionFrame.from_store(get_store())
+
+Progress = namedtuple("Progress", ["audio_hours", "video_hours", "text_records", "image_records"])
+
+def get_progress():
+    # Read the contributor's precomputed rollups instead of rescanning history
+    by_type = get_store().breakdown('type', contributor=st.session_state.contributor_id)
+    return Progress(
+        audio_hours=by_type.get('audio', EMPTY).hours,
+        video_hours=by_type.get('video', EMPTY).hours,
+        text_records=by_type.get('text', EMPTY).records,
+        image_records=by_type.get('image', EMPTY).records
+    )
+
+def language_frame():
+    import pandas as pd
+    
+    lang_data = []
+    for lang, data in LANGUAGES.items():
+        lang_data.append({
+            "Language": f"{lang} ({data['name']})",
+            "Contributors": data['contributors'], 
+            "Hours": data['hours']
+        })
+    
+    return pd.DataFrame(lang_data)
+
+@profiled("figure:home_contributors")
+def build_contributors_chart():
+    import plotly.express as px
+    
+    fig = px.bar(language_frame(), x="Language", y="Contributors", title="Contributors by Language")
+    fig.update_layout(xaxis_tickangle=45)
+    return fig
+
+@profiled("figure:home_hours")
+def build_hours_chart():
+    import plotly.express as px
+    
+    return px.pie(language_frame(), values="Hours", names="Language", title="Audio Hours by Language")
 
 def render_home():
     st.title("🗣️ Bhasha Corpus - Indic Language AI Builder")
@@ -79,13 +180,14 @@ def render_home():
         st.markdown("#### 📊 Your Progress")
         
         # Progress metrics
-        audio_progress = min(st.session_state.audio_hours + st.session_state.video_hours, 80)
-        text_progress = min(st.session_state.text_records + st.session_state.image_records, 800)
+        progress = get_progress()
+        audio_progress = min(progress.audio_hours + progress.video_hours, 80)
+        text_progress = min(progress.text_records + progress.image_records, 800)
         
         st.metric("🎵 Audio+Video Hours", f"{audio_progress:.1f}/80", 
-                 f"+{st.session_state.audio_hours + st.session_state.video_hours:.1f}")
+                 f"+{progress.audio_hours + progress.video_hours:.1f}")
         st.metric("📝 Text+Image Records", f"{text_progress}/800", 
-                 f"+{st.session_state.text_records + st.session_state.image_records}")
+                 f"+{progress.text_records + progress.image_records}")
         st.metric("🏆 Overall Progress", f"{((audio_progress/80 + text_progress/800)/2*100):.1f}%")
         
         # Weekly recommendation
@@ -108,24 +210,16 @@ def render_home():
     # Language breakdown
     st.markdown("#### 🗣️ Language Contributions")
     
-    lang_data = []
-    for lang, data in LANGUAGES.items():
-        lang_data.append({
-            "Language": f"{lang} ({data['name']})",
-            "Contributors": data['contributors'], 
-            "Hours": data['hours']
-        })
-    
-    df = pd.DataFrame(lang_data)
+    # LANGUAGES is static, so these figures are built once per process
+    figures = get_figure_cache()
     
     col1, col2 = st.columns(2)
     with col1:
-        fig = px.bar(df, x="Language", y="Contributors", title="Contributors by Language")
-        fig.update_layout(xaxis_tickangle=45) 
+        fig = figures.get("home_contributors", 0, build_contributors_chart)
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        fig = px.pie(df, values="Hours", names="Language", title="Audio Hours by Language")
+        fig = figures.get("home_hours", 0, build_hours_chart)
         st.plotly_chart(fig, use_container_width=True)
 
 def render_contribute():
@@ -135,8 +229,9 @@ def render_contribute():
     # Progress tracking header
     col1, col2, col3, col4 = st.columns(4)
     
-    audio_total = st.session_state.audio_hours + st.session_state.video_hours
-    text_total = st.session_state.text_records + st.session_state.image_records
+    progress = get_progress()
+    audio_total = progress.audio_hours + progress.video_hours
+    text_total = progress.text_records + progress.image_records
     
     audio_progress = min(audio_total / 80 * 100, 100)
     text_progress = min(text_total / 800 * 100, 100)
@@ -145,17 +240,20 @@ def render_contribute():
         st.metric("🎵 Audio Progress", f"{audio_progress:.1f}%")
         st.progress(audio_progress / 100)
     with col2:
-        st.metric("🎥 Video Progress", f"{st.session_state.video_hours:.1f}h")
-        st.progress(min(st.session_state.video_hours / 40 * 100, 100) / 100)
+        st.metric("🎥 Video Progress", f"{progress.video_hours:.1f}h")
+        st.progress(min(progress.video_hours / 40 * 100, 100) / 100)
     with col3:
         st.metric("📝 Text Progress", f"{text_progress:.1f}%") 
         st.progress(text_progress / 100)
     with col4:
-        st.metric("🖼️ Images", f"{st.session_state.image_records}/400")
-        st.progress(min(st.session_state.image_records / 400 * 100, 100) / 100)
+        st.metric("🖼️ Images", f"{progress.image_records}/400")
+        st.progress(min(progress.image_records / 400 * 100, 100) / 100)
+    
+    if st.session_state.ingest_jobs:
+        render_ingest_jobs()
     
     # Contribution tabs
-    tab1, tab2, tab3, tab4 = st.tabs(["🎤 Audio Recording", "🎥 Video Recording", "📝 Text Data", "🖼️ Image Data"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["🎤 Audio Recording", "🎥 Video Recording", "📝 Text Data", "🖼️ Image Data", "📦 Bulk Import"])
     
     with tab1:
         render_audio_contribution()
@@ -168,6 +266,70 @@ def render_contribute():
     
     with tab4:
         render_image_contribution()
+    
+    with tab5:
+        render_bulk_import()
+
+def save_contribution(contribution):
+    """Commit through the shared write queue; False if it is backed up."""
+    try:
+        get_write_queue().add(contribution)
+    except WriteQueueFull:
+        st.error("⏳ The server is saving a lot of contributions right now. Please submit again in a moment.")
+        return False
+    except WriteTimeout:
+        # Still queued, so submitting again would save it twice
+        st.warning("⏳ Saving is taking longer than usual. Your contribution is queued and will be saved "
+                   "shortly; check your history before submitting it again.")
+        return False
+    return True
+
+# Simulated processing time per media type, in seconds
+MEDIA_SECONDS = {"audio": 3, "video": 5}
+
+def ingest_processor(contribution):
+    if contribution["type"] == "audio" and contribution.get("blob_sha256"):
+        # Measured duration and quality replace the self-reported ones
+        return audio_processor(get_audio_pool(), get_blob_store().path(contribution["blob_sha256"]))
+    return media_processor(MEDIA_SECONDS[contribution["type"]])
+
+def enqueue_media(contribution):
+    try:
+        job_id = get_ingest_pool().submit(contribution, ingest_processor(contribution))
+    except IngestQueueFull:
+        st.error("⏳ Too many recordings are being processed right now. Please try again in a moment.")
+        return
+    
+    st.session_state.ingest_jobs.append(job_id)
+    st.rerun()
+
+@st.fragment(run_every=0.5)
+def render_ingest_jobs():
+    # Poll this session's queued recordings without rerunning the whole page
+    pool = get_ingest_pool()
+    pending = []
+    
+    for job_id in st.session_state.ingest_jobs:
+        job = pool.job(job_id)
+        if job is None:
+            continue
+        contrib = job.contribution
+        label = f"{contrib['type'].title()} - {contrib['language']}"
+        
+        if job.status == DONE:
+            st.toast(f"✅ **{label} saved!** +{contrib['duration_hours']:.2f} hours to corpus")
+            if contrib.get('quality_flags'):
+                st.toast(f"⚠️ {label} was flagged: {', '.join(contrib['quality_flags']).replace('_', ' ')}")
+        elif job.status == FAILED:
+            st.toast(f"❌ {label} could not be processed: {job.error}")
+        else:
+            pending.append(job_id)
+            st.progress(job.progress, f"🔴 Processing {label.lower()}...")
+    
+    if pending != st.session_state.ingest_jobs:
+        st.session_state.ingest_jobs = pending
+        # Refresh progress counters once a recording lands in the store
+        st.rerun()
 
 def render_audio_contribution():
     st.subheader("🎤 Audio Corpus Collection")
@@ -177,57 +339,21 @@ def render_audio_contribution():
     
     with col1:
         language = st.selectbox("Choose Language", 
-                               [f"{lang} ({data['name']})" for lang, data in LANGUAGES.items()],
+                               LANGUAGE_LABELS,
                                key="audio_lang")
         
-        categories = [
-            "🗣️ Common Phrases", 
-            "🔢 Numbers & Counting", 
-            "💬 Daily Conversations", 
-            "📚 Stories & Literature",
-            "🎵 Songs & Poetry",
-            "📰 News Reading",
-            "🏛️ Cultural Content",
-            "🎓 Educational Content"
-        ]
-        category = st.selectbox("Content Category", categories, key="audio_cat")
+        category = st.selectbox("Content Category", AUDIO_CATEGORIES, key="audio_cat")
     
     with col2:
-        duration_options = ["2-3 minutes", "3-5 minutes", "5-10 minutes", "10+ minutes"]
-        duration = st.selectbox("Recording Duration", duration_options, key="audio_dur")
-        
-        quality = st.selectbox("Audio Quality", ["High (Studio)", "Medium (Quiet room)", "Basic (Normal)"], key="audio_qual")
-    
-    # Sample prompts based on category
-    prompts = {
-        "🗣️ Common Phrases": [
-            "Introduce yourself and your background",
-            "Describe your daily routine", 
-            "Talk about your family and hometown",
-            "Share your favorite memories"
-        ],
-        "🔢 Numbers & Counting": [
-            "Count from 1 to 100",
-            "Say important years and dates",
-            "Describe quantities and measurements",
-            "Read phone numbers and addresses"
-        ],
-        "💬 Daily Conversations": [
-            "Order food at a restaurant",
-            "Ask for directions",
-            "Shopping conversation",
-            "Doctor visit conversation"
-        ],
-        "📚 Stories & Literature": [
-            "Tell a folk tale from your region",
-            "Recite a famous poem",
-            "Share a moral story",
-            "Describe local legends"
-        ]
-    }
+        duration = st.selectbox("Recording Duration", list(AUDIO_DURATIONS), key="audio_dur")
+        
+        quality = st.selectbox("Audio Quality", AUDIO_QUALITIES, key="audio_qual")
     
-    if category in prompts:
-        selected_prompt = st.selectbox("Choose Recording Prompt", prompts[category], key="audio_prompt")
+    uploaded_audio = st.file_uploader("Upload a recording (optional)", type=['wav'], key="upload_audio",
+                                      help="Uncompressed WAV. Duration and quality are then measured from the file.")
+    
+    if category in AUDIO_PROMPTS:
+        selected_prompt = st.selectbox("Choose Recording Prompt", AUDIO_PROMPTS[category], key="audio_prompt")
         st.info(f"🎯 **Your Task:** {selected_prompt}")
         
         with st.expander("💡 Recording Tips"):
@@ -239,26 +365,12 @@ def render_audio_contribution():
             - **Speak in your regional dialect** - variations are valuable!
             """)
     
-    # Recording simulation
-    if st.button("🎤 Start Recording", key="record_audio", type="primary"):
+    # Recording simulation, or analysis of the uploaded file
+    label = "📤 Submit Recording" if uploaded_audio else "🎤 Start Recording"
+    if st.button(label, key="record_audio", type="primary"):
         lang_clean = language.split(" (")[0]
         
-        with st.spinner("🔴 Recording in progress... Speak clearly!"):
-            # Simulate recording time
-            progress_bar = st.progress(0)
-            for i in range(100):
-                time.sleep(0.03)  # 3 second total simulation
-                progress_bar.progress(i + 1)
-        
-        # Determine duration hours
-        duration_map = {
-            "2-3 minutes": 0.04,  # 2.5 minutes = 0.04 hours
-            "3-5 minutes": 0.07,  # 4 minutes = 0.07 hours  
-            "5-10 minutes": 0.12, # 7.5 minutes = 0.12 hours
-            "10+ minutes": 0.25   # 15 minutes = 0.25 hours
-        }
-        
-        hours_added = duration_map.get(duration, 0.04)
+        hours_added = AUDIO_DURATIONS.get(duration, 0.04)
         
         # Add contribution
         contribution = {
@@ -266,20 +378,22 @@ def render_audio_contribution():
             "type": "audio",
             "language": lang_clean,
             "category": category,
-            "prompt": selected_prompt if category in prompts else "Custom recording",
+            "prompt": selected_prompt if category in AUDIO_PROMPTS else "Custom recording",
             "duration": duration,
             "duration_hours": hours_added,
             "quality": quality,
             "timestamp": datetime.now().isoformat(),
-            "contributor": st.session_state.user_name
+            "contributor": st.session_state.contributor_id,
+            "contributor_name": st.session_state.user_name,
+            "team": st.session_state.team_name
         }
         
-        st.session_state.contributions.append(contribution)
-        st.session_state.audio_hours += hours_added
+        if uploaded_audio:
+            digest, file_size, _ = get_blob_store().put(uploaded_audio)
+            contribution.update(filename=uploaded_audio.name, file_size=file_size, blob_sha256=digest)
         
-        st.success(f"✅ **Recording Saved!** +{hours_added:.2f} hours to corpus")
-        st.balloons()
-        st.rerun()
+        # Processing runs on the ingest pool; the recording is saved when it finishes
+        enqueue_media(contribution)
 
 def render_video_contribution():
     st.subheader("🎥 Video Corpus Collection") 
@@ -289,89 +403,52 @@ def render_video_contribution():
     
     with col1:
         language = st.selectbox("Choose Language", 
-                               [f"{lang} ({data['name']})" for lang, data in LANGUAGES.items()],
+                               LANGUAGE_LABELS,
                                key="video_lang")
         
-        video_types = [
-            "👋 Sign Language & Gestures",
-            "🎭 Cultural Performances", 
-            "🍳 Cooking Instructions",
-            "🏛️ Monument & Place Descriptions",
-            "📖 Story Telling with Visuals",
-            "🎓 Educational Explanations",
-            "🎨 Art & Craft Tutorials"
-        ]
-        video_type = st.selectbox("Video Type", video_types, key="video_type")
+        video_type = st.selectbox("Video Type", VIDEO_TYPES, key="video_type")
     
     with col2:
-        duration = st.selectbox("Video Duration", 
-                               ["5-10 minutes", "10-15 minutes", "15-20 minutes", "20+ minutes"], 
-                               key="video_dur")
-        
-        setting = st.selectbox("Recording Setting", 
-                              ["Indoor/Studio", "Outdoor/Natural", "Cultural Location", "Educational Setup"],
-                              key="video_setting")
-    
-    video_prompts = {
-        "👋 Sign Language & Gestures": [
-            "Demonstrate common gestures in your culture",
-            "Show traditional greeting styles",
-            "Express emotions through gestures"
-        ],
-        "🎭 Cultural Performances": [
-            "Perform a traditional dance",
-            "Sing a folk song",
-            "Demonstrate cultural rituals"
-        ],
-        "🍳 Cooking Instructions": [
-            "Cook a traditional dish step-by-step",
-            "Explain ingredients in local language",
-            "Share family recipes"
-        ]
-    }
+        duration = st.selectbox("Video Duration", list(VIDEO_DURATIONS), key="video_dur")
+        
+        setting = st.selectbox("Recording Setting", VIDEO_SETTINGS, key="video_setting")
     
-    if video_type in video_prompts:
-        prompt = st.selectbox("Video Prompt", video_prompts[video_type], key="video_prompt")
+    if video_type in VIDEO_PROMPTS:
+        prompt = st.selectbox("Video Prompt", VIDEO_PROMPTS[video_type], key="video_prompt")
         st.info(f"🎬 **Your Task:** {prompt}")
     
     if st.button("🎥 Start Video Recording", key="record_video", type="primary"):
         lang_clean = language.split(" (")[0]
         
-        with st.spinner("🔴 Recording video... Action!"):
-            progress_bar = st.progress(0)
-            for i in range(100):
-                time.sleep(0.05)  # 5 second simulation
-                progress_bar.progress(i + 1)
-        
-        # Duration mapping for videos
-        duration_map = {
-            "5-10 minutes": 0.12,  # 7.5 minutes = 0.12 hours
-            "10-15 minutes": 0.21, # 12.5 minutes = 0.21 hours
-            "15-20 minutes": 0.29, # 17.5 minutes = 0.29 hours
-            "20+ minutes": 0.42    # 25 minutes = 0.42 hours
-        }
-        
-        hours_added = duration_map.get(duration, 0.12)
+        hours_added = VIDEO_DURATIONS.get(duration, 0.12)
         
         contribution = {
             "id": str(uuid.uuid4()),
             "type": "video",
             "language": lang_clean,
             "video_type": video_type,
-            "prompt": prompt if video_type in video_prompts else "Custom video",
+            "prompt": prompt if video_type in VIDEO_PROMPTS else "Custom video",
             "duration": duration,
             "duration_hours": hours_added,
             "setting": setting,
             "timestamp": datetime.now().isoformat(),
-            "contributor": st.session_state.user_name
+            "contributor": st.session_state.contributor_id,
+            "contributor_name": st.session_state.user_name,
+            "team": st.session_state.team_name
         }
         
-        st.session_state.contributions.append(contribution)
-        st.session_state.video_hours += hours_added
-        
-        st.success(f"✅ **Video Saved!** +{hours_added:.2f} hours to corpus")
-        st.balloons()
-        st.rerun()
+        enqueue_media(contribution)
+
+def flag_script_mismatches(contribution, texts):
+    # Text in the wrong script is still saved, but flagged for review
+    checks = check_scripts([text for text, _ in texts], [lang for _, lang in texts])
+    for (_, lang), check in zip(texts, checks):
+        if not check.ok:
+            # A toast, so it survives the rerun that clears the form
+            st.toast(f"🔤 The {lang} text looks like {check.found} script rather than {check.expected}; "
+                     "it was flagged for review.")
+    if not all(check.ok for check in checks):
+        contribution["quality_flags"] = ["script_mismatch"]
 
 def render_text_contribution():
     st.subheader("📝 Text Corpus Collection")
@@ -380,29 +457,18 @@ def render_text_contribution():
     col1, col2 = st.columns(2)
     
     with col1:
-        text_type = st.selectbox("Text Type", [
-            "🌐 Translation Pairs",
-            "📚 Literature & Poetry", 
-            "📰 News & Articles",
-            "💬 Conversational Data",
-            "🏛️ Cultural Content",
-            "🎓 Educational Material",
-            "📱 Social Media Style",
-            "📧 Formal Communications"
-        ], key="text_type")
+        text_type = st.selectbox("Text Type", TEXT_TYPES, key="text_type")
         
         source_lang = st.selectbox("Source Language", 
-                                  ["English"] + list(LANGUAGES.keys()),
+                                  SOURCE_LANGUAGES,
                                   key="source_lang")
     
     with col2:
         target_lang = st.selectbox("Target Language", 
-                                  list(LANGUAGES.keys()),
+                                  LANGUAGE_NAMES,
                                   key="target_lang")
         
-        difficulty = st.selectbox("Content Difficulty", 
-                                 ["Basic/Everyday", "Intermediate", "Advanced/Technical"],
-                                 key="text_diff")
+        difficulty = st.selectbox("Content Difficulty", DIFFICULTIES, key="text_diff")
     
     # Text input areas
     col1, col2 = st.columns(2)
@@ -415,7 +481,8 @@ def render_text_contribution():
         
         # Word count
         if source_text:
-            st.caption(f"📊 {len(source_text.split())} words, {len(source_text)} characters")
+            stats = text_stats(source_text)
+            st.caption(f"📊 {stats.words} words, {stats.graphemes} characters · {dominant_script(stats) or 'No'} script")
     
     with col2:
         st.markdown(f"**{target_lang} Text:**")
@@ -424,19 +491,26 @@ def render_text_contribution():
                                  key="target_text")
         
         if target_text:
-            st.caption(f"📊 {len(target_text.split())} words, {len(target_text)} characters")
+            stats = text_stats(target_text)
+            st.caption(f"📊 {stats.words} words, {stats.graphemes} characters · {dominant_script(stats) or 'No'} script")
     
     # Additional context
     context = st.text_input("Cultural Context (optional)", 
                            placeholder="Explain cultural nuances, regional variations, usage context...",
                            key="text_context")
     
-    region = st.selectbox("Regional Dialect", 
-                         ["Standard", "Northern", "Southern", "Eastern", "Western", "Central"],
-                         key="text_region")
+    region = st.selectbox("Regional Dialect", REGIONS, key="text_region")
     
     if st.button("📤 Submit Text Contribution", key="submit_text", type="primary"):
-        if source_text and target_text and len(source_text) > 20 and len(target_text) > 20:
+        # Counted in characters as shown under each box, like bulk import does
+        if (text_stats(source_text).graphemes > MIN_TEXT_LENGTH
+                and text_stats(target_text).graphemes > MIN_TEXT_LENGTH):
+            # Reject pairs that repeat (or lightly edit) one already in the corpus
+            duplicate = get_dedupe_index().query(target_lang, source_text, target_text)
+            if duplicate:
+                st.warning(f"🔁 This pair is {duplicate[1]:.0%} similar to an existing {target_lang} contribution and was not added.")
+                return
+            
             contribution = {
                 "id": str(uuid.uuid4()),
                 "type": "text",
@@ -448,15 +522,19 @@ def render_text_contribution():
                 "difficulty": difficulty,
                 "context": context,
                 "region": region,
-                "word_count": len(target_text.split()),
+                "word_count": text_stats(target_text).words,
+                "grapheme_count": text_stats(target_text).graphemes,
                 "timestamp": datetime.now().isoformat(),
-                "contributor": st.session_state.user_name
+                "contributor": st.session_state.contributor_id,
+                "contributor_name": st.session_state.user_name,
+                "team": st.session_state.team_name
             }
+            flag_script_mismatches(contribution, [(source_text, source_lang), (target_text, target_lang)])
             
-            st.session_state.contributions.append(contribution)
-            st.session_state.text_records += 1
+            if not save_contribution(contribution):
+                return
             
-            st.success(f"✅ **Text Contribution Added!** Total records: {st.session_state.text_records}")
+            st.success(f"✅ **Text Contribution Added!** Total records: {get_progress().text_records}")
             
             # Clear the text areas
             st.session_state.source_text = ""
@@ -465,7 +543,7 @@ def render_text_contribution():
             
             st.rerun()
         else:
-            st.error("Please provide substantial text in both fields (minimum 20 characters each)")
+            st.error(f"Please provide substantial text in both fields (minimum {MIN_TEXT_LENGTH} characters each)")
 
 def render_image_contribution():
     st.subheader("🖼️ Visual Context Collection")
@@ -474,19 +552,10 @@ def render_image_contribution():
     col1, col2 = st.columns(2)
     
     with col1:
-        image_category = st.selectbox("Image Category", [
-            "🏛️ Cultural Heritage",
-            "🍽️ Food & Cuisine", 
-            "🎭 Festivals & Celebrations",
-            "🏞️ Landscapes & Places",
-            "👥 People & Portraits",
-            "📚 Documents & Text",
-            "🎨 Art & Crafts",
-            "📱 Modern Life"
-        ], key="img_cat")
+        image_category = st.selectbox("Image Category", IMAGE_CATEGORIES, key="img_cat")
         
         description_lang = st.selectbox("Description Language", 
-                                       list(LANGUAGES.keys()),
+                                       LANGUAGE_NAMES,
                                        key="desc_lang")
     
     with col2:
@@ -520,7 +589,14 @@ def render_image_contribution():
                                 key="img_tags")
         
         if st.button("📤 Submit Image + Description", key="submit_image", type="primary"):
-            if description and len(description) > 30:
+            if text_stats(description).graphemes > MIN_DESCRIPTION_LENGTH:
+                # Store the bytes once by content; identical uploads share one blob
+                digest, file_size, _ = get_blob_store().put(uploaded_image)
+                duplicate = get_store().find_by_blob(digest)
+                if duplicate:
+                    st.warning(f"🔁 This image was already contributed on {duplicate['timestamp'][:10]} and was not counted again.")
+                    return
+                
                 contribution = {
                     "id": str(uuid.uuid4()),
                     "type": "image",
@@ -531,15 +607,19 @@ def render_image_contribution():
                     "location": location,
                     "tags": tags.split(",") if tags else [],
                     "filename": uploaded_image.name,
-                    "file_size": len(uploaded_image.getvalue()),
+                    "file_size": file_size,
+                    "blob_sha256": digest,
                     "timestamp": datetime.now().isoformat(),
-                    "contributor": st.session_state.user_name
+                    "contributor": st.session_state.contributor_id,
+                    "contributor_name": st.session_state.user_name,
+                    "team": st.session_state.team_name
                 }
+                flag_script_mismatches(contribution, [(description, description_lang)])
                 
-                st.session_state.contributions.append(contribution)
-                st.session_state.image_records += 1
+                if not save_contribution(contribution):
+                    return
                 
-                st.success(f"✅ **Image Contribution Added!** Total images: {st.session_state.image_records}")
+                st.success(f"✅ **Image Contribution Added!** Total images: {get_progress().image_records}")
                 
                 # Clear description
                 st.session_state.img_desc = ""
@@ -549,69 +629,213 @@ def render_image_contribution():
                 
                 st.rerun()
             else:
-                st.error("Please provide a detailed description (minimum 30 characters)")
+                st.error(f"Please provide a detailed description (minimum {MIN_DESCRIPTION_LENGTH} characters)")
+
+def render_bulk_import():
+    st.subheader("📦 Bulk Import")
+    st.markdown("Upload existing parallel corpora or image descriptions in one go")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        kind = st.radio("Import", ["text", "image"], horizontal=True, key="bulk_kind",
+                       format_func={"text": "🌐 Translation pairs", "image": "🖼️ Image descriptions"}.get)
+        
+        uploaded_file = st.file_uploader("Upload file", type=['csv', 'tsv', 'jsonl', 'ndjson'],
+                                        key="bulk_file")
+    
+    with col2:
+        # Used for rows that leave these columns empty
+        if kind == "text":
+            defaults = {
+                "source_language": st.selectbox("Default Source Language", SOURCE_LANGUAGES,
+                                                key="bulk_source_lang"),
+                "target_language": st.selectbox("Default Target Language", LANGUAGE_NAMES,
+                                                key="bulk_target_lang"),
+                "text_type": "🌐 Translation Pairs"
+            }
+        else:
+            defaults = {
+                "language": st.selectbox("Default Description Language", LANGUAGE_NAMES,
+                                         key="bulk_desc_lang"),
+                "category": "🏛️ Cultural Heritage"
+            }
+    
+    with st.expander("📄 Expected columns"):
+        if kind == "text":
+            st.markdown(f"""
+            - **Required:** `source_text`, `target_text` (more than {MIN_TEXT_LENGTH} characters each)
+            - **Optional:** `source_language`, `target_language`, `text_type`, `difficulty`, `context`, `region`
+            """)
+        else:
+            st.markdown(f"""
+            - **Required:** `description` (more than {MIN_DESCRIPTION_LENGTH} characters)
+            - **Optional:** `language`, `category`, `cultural_significance`, `location`, `tags`, `filename`
+            """)
+    
+    if uploaded_file and st.button("📥 Import File", key="bulk_import", type="primary"):
+        dedupe_index = get_dedupe_index()
+        # Catches repeats within the file as well as against the corpus
+        seen = MinHashIndex()
+        
+        def is_duplicate(contrib):
+            if contrib['type'] != 'text':
+                return False
+            args = (contrib['target_language'], contrib['source_text'], contrib['target_text'])
+            return bool(dedupe_index.query(*args) or seen.check_and_add(contrib['id'], *args))
+        
+        progress_bar = st.progress(0.0, "Importing...")
+        
+        def report(fraction, imported, rejected):
+            progress_bar.progress(fraction, f"Imported {imported:,} rows, {rejected:,} rejected")
+        
+        try:
+            result = import_file(uploaded_file, uploaded_file.name, kind, get_store(),
+                                 st.session_state.contributor_id, st.session_state.user_name,
+                                 st.session_state.team_name, defaults, LANGUAGES, is_duplicate=is_duplicate, progress=report)
+        except (ValueError, UnicodeDecodeError, csv.Error) as e:
+            st.error(f"Could not read {uploaded_file.name}: {e}")
+            return
+        
+        st.success(f"✅ **Imported {result.imported:,} contributions!** "
+                   f"{result.duplicates:,} near-duplicates skipped, {result.rejected:,} rows rejected.")
+        if result.errors:
+            with st.expander("⚠️ Rejected rows"):
+                for line_number, reason in result.errors:
+                    st.write(f"Line {line_number}: {reason}")
+
+HISTORY_PAGE_SIZES = [10, 25, 50, 100]
+SORT_ORDERS = {"Newest first": True, "Oldest first": False}
+
+def page_cursors(key, params):
+    """Cursors of the pages visited so far; changing ``params`` starts again at page 1."""
+    state = st.session_state.get(key)
+    if state is None or state["params"] != params:
+        state = st.session_state[key] = {"params": params, "cursors": [None]}
+    return state["cursors"]
+
+def render_pager(key, cursors, next_cursor):
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if len(cursors) > 1 and st.button("⬅️ Previous", key=f"{key}_prev", use_container_width=True):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        st.caption(f"Page {len(cursors)}")
+    with col3:
+        if next_cursor is not None and st.button("Next ➡️", key=f"{key}_next", use_container_width=True):
+            cursors.append(next_cursor)
+            st.rerun()
+
+def render_history_controls(key):
+    """Type filter, sort order and page size for a paginated contribution list."""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        kind = st.selectbox("Type", ["All", "audio", "video", "text", "image"], key=f"{key}_type",
+                            format_func=str.title)
+    with col2:
+        order = st.selectbox("Sort", list(SORT_ORDERS), key=f"{key}_sort")
+    with col3:
+        page_size = st.selectbox("Per page", HISTORY_PAGE_SIZES, index=1, key=f"{key}_page_size")
+    return (None if kind == "All" else kind), SORT_ORDERS[order], page_size
 
 def render_dashboard():
+    store = get_store()
     st.title("📊 Personal Dashboard")
     st.markdown(f"**Welcome back, {st.session_state.user_name}!**")
     
     # Overall progress
     col1, col2, col3 = st.columns(3)
     
-    total_av = st.session_state.audio_hours + st.session_state.video_hours
-    total_ti = st.session_state.text_records + st.session_state.image_records
+    progress = get_progress()
+    total_av = progress.audio_hours + progress.video_hours
+    total_ti = progress.text_records + progress.image_records
     
     with col1:
         st.metric("🎯 Overall Progress", 
                  f"{((total_av/80 + total_ti/800)/2*100):.1f}%",
                  "Towards internship goal")
+    # Bucketed series: a handful of rows no matter how long the history is
+    today = date.today()
+    week_start = today - timedelta(days=today.weekday())
+    last_week_start = week_start - timedelta(days=7)
+    user = st.session_state.contributor_id
+    days = store.series("contributor", user, "day", since=week_start, until=today)
+    weeks = store.series("contributor", user, "week", since=last_week_start, until=today)
+    months = store.series("contributor", user, "month")
+    
+    def quality_score(buckets):
+        scored = sum(b.scored for b in buckets)
+        return sum(b.quality for b in buckets) / scored * 100 if scored else None
+    
+    score = quality_score(months.values())
+    this_week = quality_score([weeks.get(week_start.isoformat(), EMPTY_BUCKET)])
+    last_week = quality_score([weeks.get(last_week_start.isoformat(), EMPTY_BUCKET)])
+    
     with col2:
-        st.metric("📅 Days Active", "5", "This week")
+        st.metric("📅 Days Active", len(days), "This week")
     with col3:
-        st.metric("🏆 Quality Score", "94.2%", "+2.1%")
+        st.metric("🏆 Quality Score", f"{score:.1f}%" if score is not None else "—",
+                 f"{this_week - last_week:+.1f}% vs last week" if this_week is not None and last_week is not None else None)
     
     # Progress charts
     col1, col2 = st.columns(2)
     
+    figures = get_figure_cache()
+    # Figures built from this contributor's data change only when they contribute
+    version = store.totals(contributor=st.session_state.contributor_id).records
+    
     with col1:
         st.subheader("📈 Weekly Progress")
         
-        # Simulate weekly data
-        progress_data = pd.DataFrame({
-            'Day': ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'],
-            'Audio Hours': [2.5, 1.2, 3.8, 2.1, 4.2, 1.8, 0.9],
-            'Text Records': [15, 23, 8, 34, 19, 28, 12]
-        })
+        @profiled("figure:dashboard_weekly")
+        def build_weekly_chart():
+            import pandas as pd
+            import plotly.express as px
+            
+            week = [week_start + timedelta(days=i) for i in range(7)]
+            buckets = [days.get(day.isoformat(), EMPTY_BUCKET) for day in week]
+            progress_data = pd.DataFrame({
+                'Day': [day.strftime('%a') for day in week],
+                'Audio+Video Hours': [b.hours for b in buckets],
+                'Records': [b.records for b in buckets]
+            })
+            
+            return px.line(progress_data, x='Day', y=['Audio+Video Hours', 'Records'],
+                          title="Daily Contributions This Week")
         
-        fig = px.line(progress_data, x='Day', y=['Audio Hours', 'Text Records'],
-                     title="Daily Contributions This Week")
+        # Rebuilt when the contributor adds something or a new week starts
+        fig = figures.get(f"dashboard_weekly:{user}", (version, week_start), build_weekly_chart)
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         st.subheader("🗣️ Language Distribution")
         
         # Language contribution breakdown
-        if st.session_state.contributions:
-            lang_counts = {}
-            for contrib in st.session_state.contributions:
-                lang = contrib.get('language', 'Unknown')
-                lang_counts[lang] = lang_counts.get(lang, 0) + 1
+        lang_counts = {lang: r.records for lang, r in store.breakdown('language', contributor=st.session_state.contributor_id).items()}
+        if lang_counts:
+            @profiled("figure:dashboard_languages")
+            def build_language_chart():
+                import plotly.express as px
+                
+                return px.pie(values=list(lang_counts.values()),
+                            names=list(lang_counts.keys()),
+                            title="Your Contributions by Language")
             
-            if lang_counts:
-                fig = px.pie(values=list(lang_counts.values()), 
-                           names=list(lang_counts.keys()),
-                           title="Your Contributions by Language")
-                st.plotly_chart(fig, use_container_width=True)
+            fig = figures.get(f"dashboard_languages:{st.session_state.contributor_id}", version, build_language_chart)
+            st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("Start contributing to see your language distribution!")
     
-    # Recent contributions
-    st.subheader("📋 Recent Contributions")
+    # Contribution history, one page at a time
+    st.subheader("📋 Your Contributions")
     
-    if st.session_state.contributions:
-        recent = st.session_state.contributions[-10:]  # Last 10 contributions
-        
-        for contrib in reversed(recent):
+    kind, newest_first, page_size = render_history_controls("history")
+    cursors = page_cursors("history_pages", (st.session_state.contributor_id, kind, newest_first, page_size))
+    page = store.page(contributor=st.session_state.contributor_id, type=kind, limit=page_size,
+                      newest_first=newest_first, after=cursors[-1])
+    if page.records:
+        for contrib in page.records:
             with st.expander(f"{contrib['type'].title()} - {contrib.get('language', 'N/A')} - {contrib['timestamp'][:16].replace('T', ' ')}"):
                 col1, col2 = st.columns(2)
                 
@@ -631,6 +855,10 @@ def render_dashboard():
                 
                 if 'prompt' in contrib and contrib['prompt']:
                     st.write(f"**Prompt:** {contrib['prompt'][:100]}...")
+        
+        render_pager("history", cursors, page.next_cursor)
+    elif kind:
+        st.info("No contributions match this filter.")
     else:
         st.info("No contributions yet. Start contributing to see your activity!")
     
@@ -640,19 +868,19 @@ def render_dashboard():
     achievements = []
     
     # Check various achievements
-    if st.session_state.audio_hours > 0:
+    if progress.audio_hours > 0:
         achievements.append("🎤 First Audio Recording")
-    if st.session_state.video_hours > 0:
+    if progress.video_hours > 0:
         achievements.append("🎥 First Video Recording") 
-    if st.session_state.text_records > 0:
+    if progress.text_records > 0:
         achievements.append("📝 First Text Contribution")
-    if st.session_state.image_records > 0:
+    if progress.image_records > 0:
         achievements.append("🖼️ First Image Contribution")
-    if st.session_state.text_records >= 50:
+    if progress.text_records >= 50:
         achievements.append("📚 Text Enthusiast (50+ records)")
-    if (st.session_state.audio_hours + st.session_state.video_hours) >= 10:
+    if (progress.audio_hours + progress.video_hours) >= 10:
         achievements.append("🎵 Audio Master (10+ hours)")
-    if len(set(contrib.get('language', '') for contrib in st.session_state.contributions)) >= 3:
+    if len(lang_counts) >= 3:
         achievements.append("🌐 Multilingual Contributor")
     
     if achievements:
@@ -661,97 +889,96 @@ def render_dashboard():
     else:
         st.info("Start contributing to unlock achievements!")
 
+LEADERBOARD_SIZE = 50
+
 def render_team_progress():
     st.title("👥 Team Corpus Building")
     st.markdown("**Collaborative Indic language dataset construction**")
     
-    # Team stats
-    teams_data = {
-        "Tamil Titans": {
-            "audio": 67.8, "video": 23.4, "text": 543, "images": 234, 
-            "members": 5, "languages": ["Tamil", "English"]
-        },
-        "Hindi Heroes": {
-            "audio": 58.3, "video": 19.2, "text": 487, "images": 198, 
-            "members": 4, "languages": ["Hindi", "Punjabi", "English"]
-        },
-        "Your Team": {
-            "audio": st.session_state.audio_hours, 
-            "video": st.session_state.video_hours,
-            "text": st.session_state.text_records, 
-            "images": st.session_state.image_records,
-            "members": 1, "languages": list(set(contrib.get('language', '') for contrib in st.session_state.contributions))
-        },
-        "Bengali Bulls": {
-            "audio": 45.6, "video": 15.8, "text": 398, "images": 167, 
-            "members": 4, "languages": ["Bengali", "English"]
-        },
-        "Telugu Tigers": {
-            "audio": 52.1, "video": 18.3, "text": 423, "images": 189, 
-            "members": 5, "languages": ["Telugu", "English"]
-        }
-    }
+    # Team stats, ranked incrementally as contributions arrive
+    board = get_leaderboard()
+    teams = board.top(LEADERBOARD_SIZE)
+    
+    if not teams:
+        st.info("No team contributions yet. Set your team name in the sidebar and start contributing!")
+        return
     
     st.subheader("🏆 Team Leaderboard")
     
-    # Create leaderboard dataframe
-    leaderboard_data = []
-    for team, stats in teams_data.items():
-        total_hours = stats['audio'] + stats['video']
-        total_records = stats['text'] + stats['images']
-        overall_score = (total_hours/80 + total_records/800) * 50  # Out of 100
-        
-        leaderboard_data.append({
-            "Team": team,
-            "Audio+Video": f"{total_hours:.1f}h",
-            "Text+Images": total_records,
-            "Members": stats['members'],
-            "Languages": len(stats['languages']),
-            "Score": f"{overall_score:.1f}%"
-        })
+    my_rank = board.rank(st.session_state.team_name)
+    if my_rank:
+        st.metric(f"🏅 {st.session_state.team_name}", f"#{my_rank} of {len(board)} teams")
     
-    # Sort by score
-    df = pd.DataFrame(leaderboard_data)
-    df['ScoreNum'] = df['Score'].str.replace('%', '').astype(float)
-    df = df.sort_values('ScoreNum', ascending=False).drop('ScoreNum', axis=1)
+    # Create leaderboard dataframe (already in rank order)
+    with timed("dataframe:leaderboard"):
+        import pandas as pd
+        
+        df = pd.DataFrame({
+            "Rank": range(1, len(teams) + 1),
+            "Team": [t.name for t in teams],
+            "Audio+Video": [t.hours for t in teams],
+            "Text+Images": [t.records for t in teams],
+            "Members": [len(t.members) for t in teams],
+            "Languages": [len(t.languages) for t in teams],
+            "Score": [t.score for t in teams]
+        })
     
-    st.dataframe(df, use_container_width=True, hide_index=True)
+    st.dataframe(df, use_container_width=True, hide_index=True, column_config={
+        "Audio+Video": st.column_config.NumberColumn(format="%.1fh"),
+        "Score": st.column_config.NumberColumn(format="%.1f%%")
+    })
     
     # Team collaboration features
     col1, col2 = st.columns(2)
     
+    figures = get_figure_cache()
+    # Team figures change whenever anyone contributes
+    version = get_store().totals().records
+    
     with col1:
         st.subheader("📊 Progress Comparison")
         
-        comparison_data = []
-        for team, stats in teams_data.items():
-            comparison_data.append({
-                "Team": team,
-                "Audio Hours": stats['audio'],
-                "Text Records": stats['text']
-            })
+        @profiled("figure:team_comparison")
+        def build_comparison_chart():
+            import pandas as pd
+            import plotly.express as px
+            
+            comparison_data = []
+            for stats in teams:
+                comparison_data.append({
+                    "Team": stats.name,
+                    "Audio Hours": stats.audio,
+                    "Text Records": stats.text
+                })
+            
+            comp_df = pd.DataFrame(comparison_data)
+            fig = px.scatter(comp_df, x="Audio Hours", y="Text Records", 
+                            text="Team", title="Team Performance Scatter")
+            fig.update_traces(textposition="top center")
+            return fig
         
-        comp_df = pd.DataFrame(comparison_data)
-        fig = px.scatter(comp_df, x="Audio Hours", y="Text Records", 
-                        text="Team", title="Team Performance Scatter")
-        fig.update_traces(textposition="top center")
+        fig = figures.get("team_comparison", version, build_comparison_chart)
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         st.subheader("🌐 Language Coverage")
         
-        all_languages = set()
-        for stats in teams_data.values():
-            all_languages.update(stats['languages'])
-        
-        lang_coverage = []
-        for lang in all_languages:
-            count = sum(1 for stats in teams_data.values() if lang in stats['languages'])
-            lang_coverage.append({"Language": lang, "Teams": count})
+        @profiled("figure:team_coverage")
+        def build_coverage_chart():
+            import pandas as pd
+            import plotly.express as px
+            
+            # Counted over every team, not just the ones on the leaderboard
+            teams_per_language = get_frame().distinct_counts("language", "team")
+            
+            coverage_df = pd.DataFrame({
+                "Language": sorted(teams_per_language),
+                "Teams": [teams_per_language[lang] for lang in sorted(teams_per_language)]
+            })
+            return px.bar(coverage_df, x="Language", y="Teams", 
+                         title="Language Coverage Across Teams")
         
-        coverage_df = pd.DataFrame(lang_coverage)
-        fig = px.bar(coverage_df, x="Language", y="Teams", 
-                    title="Language Coverage Across Teams")
+        fig = figures.get("team_coverage", version, build_coverage_chart)
         st.plotly_chart(fig, use_container_width=True)
     
     # Collaboration tools
@@ -768,51 +995,80 @@ def render_team_progress():
             st.info("Loading shared task board... (Feature coming soon)")
     
     with col3:
-        if st.button("📈 Team Analytics", use_container_width=True):
-            st.info("Generating detailed team analytics... (Feature coming soon)")
+        show_analytics = st.button("📈 Team Analytics", use_container_width=True)
+    
+    if show_analytics:
+        with timed("dataframe:team_analytics"):
+            team_df = get_frame().to_pandas(team=st.session_state.team_name)
+            breakdown = team_df.groupby(["language", "type"], observed=True).agg(
+                Records=("seq", "size"), Hours=("hours", "sum"), Words=("words", "sum")
+            ).reset_index().rename(columns={"language": "Language", "type": "Type"})
+        if breakdown.empty:
+            st.info(f"{st.session_state.team_name} has no contributions yet.")
+        else:
+            st.dataframe(breakdown, use_container_width=True, hide_index=True, column_config={
+                "Hours": st.column_config.NumberColumn(format="%.1fh")
+            })
+
+def read_file(path):
+    # Downloads read the written file only when clicked, and close it again
+    with open(path, "rb") as f:
+        return f.read()
+
+# Contributor ID handling offered on the export page: label -> transform
+CONTRIBUTOR_ID_MODES = {"Keep": None, "Hash": hash_ids, "Anonymize": anonymize}
 
 def render_export():
     st.title("📥 Export & Submit Data")
     st.markdown("**Prepare your contributions for submission to corpus.swecha.org**")
     
-    if not st.session_state.contributions:
+    store = get_store()
+    contributor = st.session_state.contributor_id
+    
+    by_type = store.breakdown('type', contributor=contributor)
+    if not by_type:
         st.info("🔍 No contributions found. Start contributing to enable data export!")
         return
     
     # Summary statistics
     col1, col2, col3, col4 = st.columns(4)
     
-    audio_contribs = [c for c in st.session_state.contributions if c['type'] == 'audio']
-    video_contribs = [c for c in st.session_state.contributions if c['type'] == 'video']
-    text_contribs = [c for c in st.session_state.contributions if c['type'] == 'text']
-    image_contribs = [c for c in st.session_state.contributions if c['type'] == 'image']
+    audio, video = by_type.get('audio', EMPTY), by_type.get('video', EMPTY)
+    text, image = by_type.get('text', EMPTY), by_type.get('image', EMPTY)
     
     with col1:
-        st.metric("🎤 Audio", f"{len(audio_contribs)} recordings", f"{st.session_state.audio_hours:.1f} hours")
+        st.metric("🎤 Audio", f"{audio.records} recordings", f"{audio.hours:.1f} hours")
     with col2:
-        st.metric("🎥 Video", f"{len(video_contribs)} recordings", f"{st.session_state.video_hours:.1f} hours")
+        st.metric("🎥 Video", f"{video.records} recordings", f"{video.hours:.1f} hours")
     with col3:
-        st.metric("📝 Text", f"{len(text_contribs)} records", f"{sum(c.get('word_count', 0) for c in text_contribs)} words")
+        st.metric("📝 Text", f"{text.records} records", f"{text.words} words")
     with col4:
-        st.metric("🖼️ Images", f"{len(image_contribs)} images", "With descriptions")
+        st.metric("🖼️ Images", f"{image.records} images", "With descriptions")
     
     # Data preview
     st.subheader("📋 Contribution Summary")
     
-    # Create summary dataframe
-    summary_data = []
-    for contrib in st.session_state.contributions:
-        summary_data.append({
-            "ID": contrib['id'][:8],
-            "Type": contrib['type'].title(),
-            "Language": contrib.get('language', 'N/A'),
-            "Timestamp": contrib['timestamp'][:16].replace('T', ' '),
-            "Details": f"{contrib.get('category', contrib.get('text_type', contrib.get('video_type', 'N/A')))}"
-        })
+    # Only the visible page is read from the store and sent to the browser
+    kind, newest_first, page_size = render_history_controls("summary")
+    cursors = page_cursors("summary_pages", (contributor, kind, newest_first, page_size))
+    page = store.page(contributor=contributor, type=kind, limit=page_size,
+                      newest_first=newest_first, after=cursors[-1])
     
-    if summary_data:
-        df = pd.DataFrame(summary_data)
+    if page.records:
+        with timed("dataframe:export_summary"):
+            import pandas as pd
+            
+            df = pd.DataFrame({
+                "ID": [c['id'][:8] for c in page.records],
+                "Type": [c['type'].title() for c in page.records],
+                "Language": [contribution_language(c) or 'N/A' for c in page.records],
+                "Timestamp": [c['timestamp'][:16].replace('T', ' ') for c in page.records],
+                "Details": [c.get('category') or c.get('text_type') or c.get('video_type') or 'N/A'
+                            for c in page.records]
+            })
         st.dataframe(df, use_container_width=True, hide_index=True)
+        st.caption(f"{store.count(contributor=contributor, type=kind):,} contributions")
+        render_pager("summary", cursors, page.next_cursor)
     
     # Export options
     st.subheader("📤 Export Options")
@@ -820,67 +1076,98 @@ def render_export():
     col1, col2 = st.columns(2)
     
     with col1:
-        export_format = st.selectbox("Export Format", 
-                                   ["CSV (Recommended)", "JSON", "Excel"])
+        export_mode = st.radio("Export Mode", ["Single file", "Training shards"], horizontal=True,
+                               help="Training shards are size-bounded files with a manifest, built in parallel")
+        
+        if export_mode == "Single file":
+            export_format = st.selectbox("Export Format", list(EXPORT_FORMATS))
+        else:
+            shard_format = st.selectbox("Shard Format", list(SHARD_LABELS), format_func=SHARD_LABELS.get)
+            shard_records = st.number_input("Records per shard", min_value=100, max_value=1_000_000,
+                                            value=SHARD_RECORDS, step=1000)
+            shard_mb = st.number_input("Max shard size (MB)", min_value=1, max_value=4096,
+                                       value=SHARD_BYTES >> 20)
         
         include_metadata = st.checkbox("Include detailed metadata", value=True)
         
-        anonymize = st.checkbox("Anonymize contributor info", value=False)
+        contributor_ids = st.radio("Contributor IDs", list(CONTRIBUTOR_ID_MODES), horizontal=True,
+                                   help="Hashing keeps one pseudonym per contributor so per-speaker splits still work")
+        
+        drop_duplicates = st.checkbox("Drop near-duplicate text pairs", value=True)
     
     with col2:
-        date_filter = st.date_input("Filter by date (optional)")
+        date_range = st.date_input("Filter by date (optional)", value=(), key="export_dates",
+                                   help="Pick a start and end date; leave empty to export everything")
         
         type_filter = st.multiselect("Filter by type", 
                                    ["audio", "video", "text", "image"],
                                    default=["audio", "video", "text", "image"])
+        
+        language_filter = st.multiselect("Filter by language", LANGUAGE_NAMES,
+                                         placeholder="All languages", key="export_languages")
+    
+    # Every filter maps onto the store's (column, timestamp) indexes, so a
+    # narrow date window only reads the rows inside it
+    filters = {
+        "contributor": contributor,
+        "type": type_filter or None,
+        "language": language_filter or None,
+        "since": date_range[0].isoformat() if date_range else None,
+        "until": (date_range[-1] + timedelta(days=1)).isoformat() if date_range else None
+    }
+    st.caption(f"🔎 {store.count(**filters):,} contributions match these filters")
+    
+    # Keep only essential fields if metadata is not requested
+    columns = EXPORT_COLUMNS if include_metadata else ESSENTIAL_COLUMNS
+    
+    def export_records(extra_fields=()):
+        transform = CONTRIBUTOR_ID_MODES[contributor_ids]
+        view = ExportView(columns, [transform()] if transform else [],
+                          extra_fields=[*extra_fields, *(DEDUPE_FIELDS if drop_duplicates else ())])
+        
+        # Stream filtered contributions straight from the store, loading
+        # only the fields the export needs
+        records = store.query(fields=view.fields, **filters)
+        
+        # Dedupe text pairs in one streaming pass
+        if drop_duplicates:
+            records = drop_near_duplicates(records)
+        return view(records)
+    
+    if export_mode == "Training shards":
+        if st.button("🧩 Build Training Shards", type="primary"):
+            # Shards pack each record's media, so load its blob reference even
+            # when only the essential columns go into the metadata
+            render_shard_export(export_records(MEDIA_FIELDS), columns, shard_format, shard_records,
+                                shard_mb << 20)
+        return
     
     # Generate export data
     if st.button("📥 Generate Export File", type="primary"):
-        # Filter contributions
-        filtered_contribs = st.session_state.contributions.copy()
-        
-        if type_filter:
-            filtered_contribs = [c for c in filtered_contribs if c['type'] in type_filter]
-        
-        # Anonymize if requested
-        if anonymize:
-            for contrib in filtered_contribs:
-                contrib['contributor'] = 'Anonymous'
-        
-        # Remove metadata if not requested
-        if not include_metadata:
-            for contrib in filtered_contribs:
-                # Keep only essential fields
-                essential = ['id', 'type', 'language', 'timestamp']
-                contrib = {k: v for k, v in contrib.items() if k in essential}
-        
-        # Create export based on format
-        if export_format == "CSV (Recommended)":
-            df = pd.DataFrame(filtered_contribs)
-            csv = df.to_csv(index=False)
-            
-            filename = f"indic_language_corpus_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            
-            st.download_button(
-                label="📥 Download CSV for corpus.swecha.org",
-                data=csv,
-                file_name=filename,
-                mime="text/csv",
-                use_container_width=True
-            )
-        
-        elif export_format == "JSON":
-            json_data = json.dumps(filtered_contribs, indent=2, default=str)
-            
-            filename = f"indic_language_corpus_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            
-            st.download_button(
-                label="📥 Download JSON",
-                data=json_data,
-                file_name=filename,
-                mime="application/json",
-                use_container_width=True
-            )
+        fmt, extension, mime = EXPORT_FORMATS[export_format]
+        records = export_records()
+        
+        filename = f"indic_language_corpus_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        export_path = os.path.join(EXPORT_DIR, filename)
+        
+        try:
+            with st.spinner("Writing export file..."), timed(f"export:{fmt}"):
+                exported = write_export(records, export_path, fmt, columns=columns)
+        except ImportError as e:
+            st.error(f"{export_format} export needs an extra package: {e.name}")
+            return
+        
+        # The file is only read back when the user actually downloads it
+        st.download_button(
+            label=f"📥 Download {export_format.split(' (')[0]} for corpus.swecha.org",
+            data=partial(read_file, export_path),
+            file_name=filename,
+            mime=mime,
+            on_click="ignore",
+            use_container_width=True
+        )
+        st.caption(f"{exported} records, {os.path.getsize(export_path) / 1024:.1f} KB")
         
         st.success("✅ Export file ready for download!")
         
@@ -907,22 +1194,219 @@ def render_export():
             - **Team Collaboration**: Contributing to shared dataset
             - **Quality Focus**: High-quality contributions with metadata
             """.format(
-                st.session_state.audio_hours + st.session_state.video_hours, 80,
-                st.session_state.text_records + st.session_state.image_records, 800
+                audio.hours + video.hours, 80,
+                text.records + image.records, 800
             ))
 
+SEARCH_PAGE_SIZES = [10, 20, 50]
+
+def render_search():
+    st.title("🔎 Search Contributions")
+    st.markdown("Find any of your past contributions by its text, description, tags or prompt")
+    
+    col1, col2, col3 = st.columns([3, 1, 1])
+    
+    with col1:
+        query = st.text_input("Search", placeholder="e.g. नमस्ते or festiv* for words starting with festiv",
+                              key="search_query")
+    with col2:
+        search_type = st.selectbox("Type", ["All", "audio", "video", "text", "image"], key="search_type",
+                                   format_func=str.title)
+    with col3:
+        page_size = st.selectbox("Per page", SEARCH_PAGE_SIZES, index=1, key="search_page_size")
+    
+    cursors = page_cursors("search_pages", (query, search_type, page_size, st.session_state.contributor_id))
+    
+    if not query.strip():
+        st.info("Type a word to search. End it with * to match every word starting with it.")
+        return
+    
+    start = datetime.now()
+    # One extra row tells us whether there is a next page
+    # Like the history pages, search only covers this session's own contributions
+    results = get_store().search(query, type=None if search_type == "All" else search_type,
+                                 contributor=st.session_state.contributor_id,
+                                 limit=page_size + 1, before=cursors[-1])
+    elapsed = (datetime.now() - start).total_seconds() * 1000
+    has_next = len(results) > page_size
+    results = results[:page_size]
+    
+    if not results:
+        st.warning("No contributions match your search.")
+        return
+    
+    st.caption(f"{len(results)} results · {elapsed:.1f} ms")
+    
+    for seq, contrib in results:
+        language = contrib.get('language') or contrib.get('target_language', 'N/A')
+        with st.expander(f"{contrib['type'].title()} - {language} - "
+                         f"{contrib['timestamp'][:16].replace('T', ' ')}"):
+            if contrib['type'] == 'text':
+                st.write(f"**Source ({contrib.get('source_language', 'N/A')}):** {contrib.get('source_text', '')}")
+                st.write(f"**Target ({contrib.get('target_language', 'N/A')}):** {contrib.get('target_text', '')}")
+            elif contrib['type'] == 'image':
+                st.write(f"**Description:** {contrib.get('description', '')}")
+                if contrib.get('cultural_significance'):
+                    st.write(f"**Cultural Significance:** {contrib['cultural_significance']}")
+                if contrib.get('tags'):
+                    st.write(f"**Tags:** {', '.join(contrib['tags'])}")
+            if contrib.get('prompt'):
+                st.write(f"**Prompt:** {contrib['prompt']}")
+    
+    render_pager("search", cursors, results[-1][0] if has_next else None)
+
+# Admin-only pages are shown when BHASHA_ADMIN is set
+ADMIN = os.environ.get("BHASHA_ADMIN", "") not in ("", "0")
+
+def render_profiling():
+    st.title("🛠️ Profiling")
+    st.markdown("Wall time and memory deltas of page renders, figure builds and exports in this server process")
+    
+    col1, col2, col3, col4, col5 = st.columns(5)
+    
+    blocks = profiler.snapshot()
+    figures = get_figure_cache()
+    writes = get_write_queue()
+    with col1:
+        st.metric("🔁 Reruns", f"{profiler.reruns:,}")
+    with col2:
+        st.metric("⏱️ Timed Blocks", len(blocks))
+    with col3:
+        lookups = figures.hits + figures.misses
+        st.metric("🖼️ Figure Cache Hits", f"{figures.hits / lookups:.0%}" if lookups else "—",
+                  help=f"{figures.hits:,} hits, {figures.misses:,} rebuilds, {len(figures)} figures cached")
+    with col4:
+        st.metric("💾 Writes per Commit", f"{writes.committed / writes.batches:.1f}" if writes.batches else "—",
+                  help=f"{writes.committed:,} contributions in {writes.batches:,} commits, {len(writes)} queued")
+    with col5:
+        trace = st.toggle("Trace allocations (tracemalloc)", value=tracemalloc.is_tracing(),
+                          help="Exact allocated bytes instead of RSS, at a noticeable speed cost")
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not trace and tracemalloc.is_tracing():
+            tracemalloc.stop()
+    
+    if blocks:
+        import pandas as pd
+        
+        st.dataframe(pd.DataFrame(blocks), use_container_width=True, hide_index=True, column_config={
+            "total_ms": st.column_config.NumberColumn("Total (ms)", format="%.1f"),
+            "mean_ms": st.column_config.NumberColumn("Mean (ms)", format="%.2f"),
+            "max_ms": st.column_config.NumberColumn("Max (ms)", format="%.2f"),
+            "last_ms": st.column_config.NumberColumn("Last (ms)", format="%.2f"),
+            "memory_bytes": st.column_config.NumberColumn("Memory Δ (bytes)", format="%d")
+        })
+    
+    col1, col2, col3 = st.columns(3)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    with col1:
+        st.download_button("📄 Samples (JSON Lines)", data=profiler.to_jsonl,
+                           file_name=f"profile_{stamp}.jsonl", mime="application/x-ndjson",
+                           on_click="ignore", use_container_width=True)
+    with col2:
+        st.download_button("📈 Metrics (Prometheus)", data=profiler.to_prometheus,
+                           file_name=f"profile_{stamp}.prom", mime="text/plain",
+                           on_click="ignore", use_container_width=True)
+    with col3:
+        if st.button("🗑️ Reset", key="profiling_reset", use_container_width=True):
+            profiler.reset()
+            st.rerun()
+
+SHARD_LABELS = {"tar": "WebDataset tar (metadata + media)", "parquet": "Parquet"}
+
+def render_shard_export(records, columns, fmt, max_records, max_bytes):
+    directory = os.path.join(EXPORT_DIR, f"indic_language_shards_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    status = st.empty()
+    
+    def report(shards, written):
+        status.caption(f"🧩 {shards} shards written, {written:,} records")
+    
+    try:
+        with st.spinner("Writing shards in parallel..."), timed(f"export:shards:{fmt}"):
+            manifest = write_shards(records, directory, fmt, columns=columns, max_records=max_records,
+                                    max_bytes=max_bytes, blob_root=get_blob_store().root, progress=report)
+    except ImportError as e:
+        st.error(f"{SHARD_LABELS[fmt]} shards need an extra package: {e.name}")
+        return
+    
+    st.success(f"✅ {manifest['records']:,} records in {len(manifest['shards'])} shards, "
+               f"{manifest['bytes'] / 1024 / 1024:.1f} MB")
+    st.caption(f"📁 Written to `{directory}`")
+    
+    missing = sum(shard['missing_blobs'] for shard in manifest['shards'])
+    if missing:
+        st.warning(f"⚠️ {missing} media files referenced by contributions were not found in the blob store")
+    
+    if manifest['shards']:
+        import pandas as pd
+        
+        st.dataframe(pd.DataFrame(manifest['shards']), use_container_width=True, hide_index=True)
+    
+    st.download_button(
+        label="📄 Download manifest.json",
+        data=partial(read_file, os.path.join(directory, MANIFEST)),
+        file_name=f"{os.path.basename(directory)}_{MANIFEST}",
+        mime="application/json",
+        on_click="ignore",
+        use_container_width=True
+    )
+
 # Main application
+SESSION_KEYS = ("user_name", "team_name")
+
+def default_contributor(session_id):
+    # Unique per session, so a new tab never sees another visitor's history
+    return f"Contributor {session_id[:8]}"
+
+def contributor_key(session_id):
+    # What contributions are stored and filtered under. The display name is
+    # only a label anyone can type, and the session id itself grants access
+    # to the session, so rows and exports carry a one-way hash of it.
+    return hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:16]
+
+def restore_session():
+    # The session id rides in the URL, so a reopened tab or a restarted
+    # server picks up the same contributor and team from the journal
+    session_id = st.query_params.get("session")
+    if not session_id:
+        session_id = uuid.uuid4().hex
+        st.query_params["session"] = session_id
+    st.session_state.session_id = session_id
+    st.session_state.contributor_id = contributor_key(session_id)
+    st.session_state.user_name = default_contributor(session_id)
+    for key, value in get_journal().get("session", session_id, {}).items():
+        st.session_state[key] = value
+    st.session_state.user_input = st.session_state.user_name
+    st.session_state.team_input = st.session_state.team_name
+
+def update_identity():
+    # A cleared name falls back to the session's own, never to a shared one
+    st.session_state.user_name = st.session_state.user_input.strip() or default_contributor(st.session_state.session_id)
+    st.session_state.team_name = st.session_state.team_input.strip() or DEFAULT_TEAM
+    st.session_state.user_input = st.session_state.user_name
+    st.session_state.team_input = st.session_state.team_name
+    save_session()
+
+def save_session():
+    get_journal().put("session", st.session_state.session_id,
+                      {key: st.session_state[key] for key in SESSION_KEYS})
+
 def main():
+    profiler.rerun()
+    
+    if 'session_id' not in st.session_state:
+        restore_session()
+        # Starting the pool resumes recordings a restart interrupted
+        get_ingest_pool()
+    
     # Sidebar navigation
-    with st.sidebar:
+    with st.sidebar, timed("sidebar"):
         st.markdown("### 🗣️ Bhasha Corpus")
         st.caption("Indic Language AI Builder")
         
         # User info
-        user_name = st.text_input("Your Name", value=st.session_state.user_name, key="user_input")
-        if user_name != st.session_state.user_name:
-            st.session_state.user_name = user_name
-            st.rerun()
+        st.text_input("Your Name", key="user_input", on_change=update_identity)
+        st.text_input("Your Team", key="team_input", on_change=update_identity)
         
         st.markdown("---")
         
@@ -932,8 +1416,11 @@ def main():
             "📤 Contribute": "contribute", 
             "📊 Dashboard": "dashboard",
             "👥 Team Progress": "team",
-            "📥 Export Data": "export"
+            "📥 Export Data": "export",
+            "🔎 Search": "search"
         }
+        if ADMIN:
+            pages["🛠️ Profiling"] = "profiling"
         
         st.markdown("#### 📋 Navigation")
         for label, key in pages.items():
@@ -945,14 +1432,15 @@ def main():
         
         # Quick stats
         st.markdown("#### 📊 Quick Stats")
-        st.metric("🎵 Your Audio", f"{st.session_state.audio_hours:.1f}h")
-        st.metric("🎥 Your Video", f"{st.session_state.video_hours:.1f}h") 
-        st.metric("📝 Your Text", f"{st.session_state.text_records}")
-        st.metric("🖼️ Your Images", f"{st.session_state.image_records}")
+        progress = get_progress()
+        st.metric("🎵 Your Audio", f"{progress.audio_hours:.1f}h")
+        st.metric("🎥 Your Video", f"{progress.video_hours:.1f}h") 
+        st.metric("📝 Your Text", f"{progress.text_records}")
+        st.metric("🖼️ Your Images", f"{progress.image_records}")
         
         # Progress bars
-        audio_video_progress = min((st.session_state.audio_hours + st.session_state.video_hours) / 80, 1.0)
-        text_image_progress = min((st.session_state.text_records + st.session_state.image_records) / 800, 1.0)
+        audio_video_progress = min((progress.audio_hours + progress.video_hours) / 80, 1.0)
+        text_image_progress = min((progress.text_records + progress.image_records) / 800, 1.0)
         
         st.progress(audio_video_progress, "Audio+Video Progress")
         st.progress(text_image_progress, "Text+Image Progress")
@@ -967,16 +1455,21 @@ def main():
     # Main content area
     page = st.session_state.current_page
     
-    if page == 'home':
-        render_home()
-    elif page == 'contribute':
-        render_contribute()
-    elif page == 'dashboard':
-        render_dashboard()
-    elif page == 'team':
-        render_team_progress()
-    elif page == 'export':
-        render_export()
+    with timed(f"page:{page}"):
+        if page == 'home':
+            render_home()
+        elif page == 'contribute':
+            render_contribute()
+        elif page == 'dashboard':
+            render_dashboard()
+        elif page == 'team':
+            render_team_progress()
+        elif page == 'export':
+            render_export()
+        elif page == 'search':
+            render_search()
+        elif page == 'profiling' and ADMIN:
+            render_profiling()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,95 @@
+"""Cold-start and rerun time of the Streamlit script, per page.
+
+Each page is run in a fresh interpreter through Streamlit's AppTest
+harness against an empty store. The first run includes importing the
+app's modules (the cold start a new server process pays). Later runs
+are ordinary reruns. The runner also records whether pandas and plotly
+got loaded.
+
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --app /path/to/older/checkout/app.py
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.run import RESULTS_DIR, environment
+
+PAGES = ["home", "contribute", "dashboard", "team", "export", "search"]
+RERUNS = 10
+HEAVY_MODULES = ["pandas", "plotly.express", "pyarrow"]
+
+
+def measure(app, page, reruns):
+    """Runs inside the child interpreter."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app, default_timeout=120)
+    at.session_state["current_page"] = page
+    start = time.perf_counter()
+    at.run()
+    cold = time.perf_counter() - start
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - start)
+    return {
+        "page": page,
+        "cold_ms": cold * 1000,
+        "rerun_ms": statistics.median(samples) * 1000,
+        "loaded": {name: name in sys.modules for name in HEAVY_MODULES},
+        "error": str(at.exception[0].message) if at.exception else None,
+    }
+
+
+def run_page(app, page, reruns):
+    with tempfile.TemporaryDirectory(prefix="bhasha-cold-") as directory:
+        env = dict(os.environ, BHASHA_STORE="sqlite:" + os.path.join(directory, "cold.db"),
+                   BHASHA_BLOB_DIR=os.path.join(directory, "blobs"),
+                   BHASHA_JOURNAL_DIR=os.path.join(directory, "journal"))
+        child = subprocess.run(
+            [sys.executable, "-m", "benchmarks.cold_start", "--child", page, "--app", app, "--reruns", str(reruns)],
+            capture_output=True, text=True, env=env, check=True,
+        )
+    return json.loads(child.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default=os.path.abspath("app.py"))
+    parser.add_argument("--pages", default=",".join(PAGES))
+    parser.add_argument("--reruns", type=int, default=RERUNS)
+    parser.add_argument("--output", help="results file (default: data/benchmarks/cold_start_<time>.json)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(args.app, args.child, args.reruns)))
+        return
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"cold_start_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    report = {"environment": environment(), "app": args.app, "results": []}
+    print(f"{'page':12s} {'cold ms':>10s} {'rerun ms':>10s}  loaded", file=sys.stderr)
+    for page in args.pages.split(","):
+        result = run_page(args.app, page, args.reruns)
+        report["results"].append(result)
+        loaded = ", ".join(name for name, is_loaded in result["loaded"].items() if is_loaded) or "-"
+        print(f"{page:12s} {result['cold_ms']:10.1f} {result['rerun_ms']:10.1f}  {loaded}", file=sys.stderr)
+
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
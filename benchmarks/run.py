@@ -0,0 +1,237 @@
+"""Benchmark the contribution pipeline on synthetic corpora.
+
+For each size a fresh store is filled from the synthetic generator, then
+the runner times:
+
+- inserts (through the store's indexers, as the app writes)
+- the dashboard's rollup and paging reads
+- building and querying the team leaderboard
+- full-text search
+- a script check of every text field in the corpus
+- a full-corpus export (time, and peak memory with tracemalloc)
+
+Results go to a JSON file. Pass ``--compare`` to diff two result files.
+
+    python -m benchmarks.run --sizes 1k,10k,100k
+    python -m benchmarks.run --compare old.json new.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.synthetic import Generator
+from exporter import write_export
+from leaderboard import TeamLeaderboard
+from profiling import memory_usage
+from store import SQLiteStore
+from textstats import SCRIPT_CHECKED_FIELDS, script_mismatches
+
+DEFAULT_SIZES = "1k,10k,100k"
+RESULTS_DIR = os.path.join("data", "benchmarks")
+REPEAT = 20
+SEARCH_QUERIES = ["festival", "the market", "riv*", "temple morning"]
+SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_size(text):
+    text = text.strip().lower()
+    if text[-1:] in SUFFIXES:
+        return int(float(text[:-1]) * SUFFIXES[text[-1]])
+    return int(text)
+
+
+def median_ms(func, repeat=REPEAT):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def bench_insert(store, n, seed):
+    generated = 0.0
+    start = time.perf_counter()
+    batches = Generator(seed).batches(n)
+    while True:
+        t = time.perf_counter()
+        batch = next(batches, None)
+        generated += time.perf_counter() - t
+        if batch is None:
+            break
+        store.add_many(batch)
+    # Generation is not part of the pipeline under test
+    seconds = time.perf_counter() - start - generated
+    return {"seconds": seconds, "rows_per_second": n / seconds if seconds else None, "generate_seconds": generated}
+
+
+def bench_dashboard(store, contributor):
+    def dashboard():
+        store.breakdown("type", contributor=contributor)
+        store.totals(contributor=contributor)
+        store.breakdown("language", contributor=contributor)
+        store.page(contributor=contributor, limit=25)
+
+    page = store.page(contributor=contributor, limit=25)
+    return {
+        "dashboard_ms": median_ms(dashboard),
+        "corpus_totals_ms": median_ms(lambda: store.breakdown("type")),
+        "first_page_ms": median_ms(lambda: store.page(contributor=contributor, limit=25)),
+        "next_page_ms": median_ms(lambda: store.page(contributor=contributor, limit=25, after=page.next_cursor)),
+        "count_ms": median_ms(lambda: store.count(contributor=contributor)),
+    }
+
+
+def bench_leaderboard(store):
+    start = time.perf_counter()
+    before = memory_usage()
+    board = TeamLeaderboard.from_store(store)
+    build = time.perf_counter() - start
+    after = memory_usage()
+    teams = [stats.name for stats in board.top()]
+    middle = teams[len(teams) // 2] if teams else None
+    return {
+        "build_seconds": build,
+        "memory_bytes": after - before if before is not None and after is not None else None,
+        "teams": len(teams),
+        "top50_ms": median_ms(lambda: board.top(50)),
+        "rank_ms": median_ms(lambda: board.rank(middle)),
+    }
+
+
+def bench_search(store):
+    results = {}
+    for query in SEARCH_QUERIES:
+        hits = store.search(query, limit=20)
+        results[query] = {
+            "first_page_ms": median_ms(lambda: store.search(query, limit=20)),
+            "next_page_ms": median_ms(lambda: store.search(query, limit=20, before=hits[-1][0])) if hits else None,
+            "hits": len(hits),
+        }
+    return results
+
+
+def bench_scripts(store):
+    fields = ["id", "type"] + [name for pair in SCRIPT_CHECKED_FIELDS for name in pair]
+    start = time.perf_counter()
+    mismatches = sum(1 for _ in script_mismatches(store.query(fields=fields)))
+    seconds = time.perf_counter() - start
+    records = store.count()
+    return {"seconds": seconds, "records_per_minute": records / seconds * 60 if seconds else None,
+            "mismatches": mismatches}
+
+
+def bench_export(store, directory, fmt, trace_memory):
+    path = os.path.join(directory, f"export.{fmt}")
+    start = time.perf_counter()
+    rows = write_export(store.query(), path, fmt)
+    result = {"seconds": time.perf_counter() - start, "rows": rows, "bytes": os.path.getsize(path)}
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            write_export(store.query(), path, fmt)
+            result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_size(n, args):
+    directory = tempfile.mkdtemp(prefix="bhasha-bench-")
+    try:
+        store = SQLiteStore(os.path.join(directory, "bench.db"))
+        result = {"size": n, "insert": bench_insert(store, n, args.seed)}
+        # The heaviest contributor is the worst case for per-contributor reads
+        contributor = max(store.count_by("contributor").items(), key=lambda item: item[1])[0]
+        result["dashboard"] = bench_dashboard(store, contributor)
+        result["leaderboard"] = bench_leaderboard(store)
+        result["search"] = bench_search(store)
+        result["scripts"] = bench_scripts(store)
+        result["export"] = {fmt: bench_export(store, directory, fmt, args.memory) for fmt in args.formats}
+        # Fold the WAL back into the main file so its size covers all the data
+        store.connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        result["database_bytes"] = os.path.getsize(store.path)
+        store.close()
+        return result
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sqlite": sqlite3.sqlite_version,
+        "commit": commit,
+    }
+
+
+def flatten(value, prefix=""):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from flatten(item, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, value
+
+
+def compare(old_path, new_path):
+    """Print every metric of two result files side by side with the ratio new/old."""
+    with open(old_path) as f:
+        old = {r["size"]: dict(flatten(r)) for r in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = {r["size"]: dict(flatten(r)) for r in json.load(f)["results"]}
+    for size in sorted(old.keys() & new.keys()):
+        print(f"== {size:,} contributions")
+        for metric, before in old[size].items():
+            after = new[size].get(metric)
+            if after is None or metric == "size":
+                continue
+            ratio = f"{after / before:6.2f}x" if before else "     -"
+            print(f"{metric:55s} {before:14.3f} {after:14.3f} {ratio}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated corpus sizes, e.g. 1k,1m,10m")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--formats", default="csv,parquet", type=lambda s: s.split(","))
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="skip the traced export run that measures peak memory")
+    parser.add_argument("--output", help="results file (default: data/benchmarks/bench_<time>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    report = {"environment": environment(), "seed": args.seed, "results": []}
+    for n in (parse_size(s) for s in args.sizes.split(",")):
+        print(f"Benchmarking {n:,} contributions...", file=sys.stderr)
+        report["results"].append(run_size(n, args))
+        # Write after every size so a long run still leaves partial results
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
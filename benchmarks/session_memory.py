@@ -0,0 +1,132 @@
+"""Per-session memory against the size of a contributor's history.
+
+For each size a store is filled with that many contributions by one
+contributor. A fresh interpreter then drives one session through
+the dashboard (paging through its history), the export page and search
+with Streamlit's AppTest harness, and reports:
+
+- how many bytes the session state pickles to
+- the heap the session still holds once the runs finish, from tracemalloc
+
+Both should stay flat as the history grows. Only the current page of
+contributions is ever loaded; everything else stays in the store.
+
+    python -m benchmarks.session_memory --sizes 0,1k,10k,100k
+"""
+import argparse
+import gc
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.run import RESULTS_DIR, environment, parse_size
+from benchmarks.synthetic import Generator
+
+DEFAULT_SIZES = "0,1k,10k,100k"
+CONTRIBUTOR = "Language Contributor"
+PAGES_VISITED = 5
+
+
+def fill(path, n, seed=0):
+    from store import SQLiteStore
+
+    store = SQLiteStore(path)
+    for batch in Generator(seed, contributors=1).batches(n):
+        for contribution in batch:
+            contribution["contributor"] = CONTRIBUTOR
+        store.add_many(batch)
+    store.close()
+
+
+def session_bytes(state):
+    total = 0
+    for key in state.keys():
+        try:
+            total += len(pickle.dumps(state[key]))
+        except Exception:
+            # Widget values such as uploaded files don't pickle; they are bounded by the form anyway
+            continue
+    return total
+
+
+def measure(app):
+    """Runs inside the child interpreter."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app, default_timeout=120)
+    # Sign the session in as the contributor whose history was generated
+    at.session_state["session_id"] = "benchmark"
+    at.session_state["user_name"] = at.session_state["user_input"] = CONTRIBUTOR
+    at.session_state["current_page"] = "dashboard"
+    at.run()
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for _ in range(PAGES_VISITED):
+        nxt = [b for b in at.button if b.key == "history_next"]
+        if not nxt:
+            break
+        nxt[0].click().run()
+    for page in ("export", "search", "dashboard"):
+        at.session_state["current_page"] = page
+        at.run()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return {
+        "session_state_bytes": session_bytes(at.session_state),
+        "retained_heap_bytes": retained,
+        "error": str(at.exception[0].message) if at.exception else None,
+    }
+
+
+def run_size(app, n, seed):
+    with tempfile.TemporaryDirectory(prefix="bhasha-session-") as directory:
+        path = os.path.join(directory, "session.db")
+        fill(path, n, seed)
+        env = dict(os.environ, BHASHA_STORE="sqlite:" + path, BHASHA_BLOB_DIR=os.path.join(directory, "blobs"),
+                   BHASHA_JOURNAL_DIR=os.path.join(directory, "journal"))
+        child = subprocess.run(
+            [sys.executable, "-m", "benchmarks.session_memory", "--child", "--app", app],
+            capture_output=True, text=True, env=env, check=True,
+        )
+    return {"size": n, **json.loads(child.stdout.strip().splitlines()[-1])}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default=os.path.abspath("app.py"))
+    parser.add_argument("--sizes", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="results file (default: data/benchmarks/session_memory_<time>.json)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(args.app)))
+        return
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"session_memory_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    report = {"environment": environment(), "app": args.app, "results": []}
+    print(f"{'history':>10s} {'session KB':>12s} {'retained KB':>12s}", file=sys.stderr)
+    for size in args.sizes.split(","):
+        result = run_size(args.app, parse_size(size), args.seed)
+        report["results"].append(result)
+        print(f"{result['size']:10,d} {result['session_state_bytes'] / 1024:12.1f} "
+              f"{result['retained_heap_bytes'] / 1024:12.1f}", file=sys.stderr)
+
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
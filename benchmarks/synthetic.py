@@ -0,0 +1,137 @@
+"""Deterministic synthetic contributions for benchmarks.
+
+Contributions follow the app's own catalog: languages are weighted by
+their contributor counts, and every type, category, prompt and duration
+comes from the contribution forms. Text is made of pseudo-words in each
+language's script with a Zipf-like frequency, so search postings and
+dedupe buckets are skewed the way real text is.
+"""
+import random
+import unicodedata
+import uuid
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from catalog import (
+    AUDIO_CATEGORIES, AUDIO_DURATIONS, AUDIO_PROMPTS, AUDIO_QUALITIES, DIFFICULTIES, IMAGE_CATEGORIES,
+    LANGUAGES, REGIONS, TEXT_TYPES, VIDEO_DURATIONS, VIDEO_PROMPTS, VIDEO_SETTINGS, VIDEO_TYPES,
+)
+from textstats import text_stats_batch
+
+TYPE_MIX = {"audio": 0.30, "video": 0.10, "text": 0.45, "image": 0.15}
+
+# First code point of each language's Unicode block
+SCRIPT_BLOCKS = {
+    "Hindi": 0x0900,
+    "Marathi": 0x0900,
+    "Bengali": 0x0980,
+    "Gujarati": 0x0A80,
+    "Tamil": 0x0B80,
+    "Telugu": 0x0C00,
+    "Kannada": 0x0C80,
+    "Malayalam": 0x0D00,
+}
+
+ENGLISH_WORDS = (
+    "the of and to in is you that it he was for on are as with his they at be this have from or one "
+    "had by word but not what all were we when your can said there use an each which she do how their "
+    "if will up other about out many then them these so some her would make like him into time has look "
+    "two more write go see number no way could people my than first water been call who oil its now find "
+    "festival market river temple village harvest monsoon family school mother father morning evening"
+).split()
+
+VOCABULARY_SIZE = 2000
+DAYS = 90
+BATCH_SIZE = 2000
+
+
+def _pseudo_words(rng, block, count):
+    consonants = [chr(block + i) for i in range(0x15, 0x3A) if unicodedata.category(chr(block + i)) == "Lo"]
+    signs = [chr(block + i) for i in range(0x3E, 0x4D) if unicodedata.category(chr(block + i)) in ("Mc", "Mn")]
+    words = set()
+    while len(words) < count:
+        syllables = rng.randint(1, 4)
+        words.add("".join(
+            rng.choice(consonants) + (rng.choice(signs) if rng.random() < 0.6 else "")
+            for _ in range(syllables)
+        ))
+    return sorted(words)
+
+
+class Generator:
+    def __init__(self, seed=0, contributors=None):
+        self.rng = random.Random(seed)
+        self.languages = list(LANGUAGES)
+        self.language_weights = list(accumulate(data["contributors"] for data in LANGUAGES.values()))
+        self.types = list(TYPE_MIX)
+        self.type_weights = list(accumulate(TYPE_MIX.values()))
+        self.vocabulary = {"English": ENGLISH_WORDS}
+        for language, block in SCRIPT_BLOCKS.items():
+            self.vocabulary[language] = _pseudo_words(self.rng, block, VOCABULARY_SIZE)
+        # Zipf-like: the k-th most common word is k times rarer than the first
+        self.word_weights = {
+            language: list(accumulate(1 / rank for rank in range(1, len(words) + 1)))
+            for language, words in self.vocabulary.items()
+        }
+        self.contributors = contributors
+
+    def words(self, language, mean):
+        count = max(1, int(self.rng.lognormvariate(0, 0.6) * mean))
+        return " ".join(self.rng.choices(self.vocabulary[language], cum_weights=self.word_weights[language], k=count))
+
+    def contribution(self, timestamp, contributor, team):
+        rng = self.rng
+        kind = rng.choices(self.types, cum_weights=self.type_weights)[0]
+        language = rng.choices(self.languages, cum_weights=self.language_weights)[0]
+        c = {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "type": kind,
+            "timestamp": timestamp.isoformat(),
+            "contributor": contributor,
+            "team": team,
+        }
+        if kind == "audio":
+            category = rng.choice(AUDIO_CATEGORIES)
+            duration = rng.choice(list(AUDIO_DURATIONS))
+            c.update(language=language, category=category, duration=duration,
+                     duration_hours=AUDIO_DURATIONS[duration], quality=rng.choice(AUDIO_QUALITIES),
+                     prompt=rng.choice(AUDIO_PROMPTS.get(category, ["Custom recording"])))
+        elif kind == "video":
+            video_type = rng.choice(VIDEO_TYPES)
+            duration = rng.choice(list(VIDEO_DURATIONS))
+            c.update(language=language, video_type=video_type, duration=duration,
+                     duration_hours=VIDEO_DURATIONS[duration], setting=rng.choice(VIDEO_SETTINGS),
+                     prompt=rng.choice(VIDEO_PROMPTS.get(video_type, ["Custom video"])))
+        elif kind == "text":
+            if language == "English":
+                language = "Hindi"
+            c.update(text_type=rng.choice(TEXT_TYPES), source_language="English", target_language=language,
+                     source_text=self.words("English", 18), target_text=self.words(language, 15),
+                     difficulty=rng.choice(DIFFICULTIES), context="", region=rng.choice(REGIONS))
+        else:
+            c.update(category=rng.choice(IMAGE_CATEGORIES), language=language,
+                     description=self.words(language, 25), cultural_significance=self.words(language, 8),
+                     location="", tags=self.words("English", 3).split(), filename=f"{c['id'][:8]}.jpg",
+                     file_size=rng.randint(50_000, 5_000_000))
+        return c
+
+    def batches(self, n, batch_size=BATCH_SIZE, start=None):
+        """Yield lists of ``n`` contributions in timestamp order."""
+        rng = self.rng
+        # Roughly one contributor per 200 records and five per team, as in a cohort
+        people = self.contributors or max(5, min(n // 200, 50_000))
+        teams = max(1, people // 5)
+        start = start or datetime(2024, 1, 1)
+        step = timedelta(days=DAYS) / max(n, 1)
+        done = 0
+        while done < n:
+            batch = []
+            for i in range(done, min(done + batch_size, n)):
+                person = int(rng.paretovariate(1.2)) % people
+                batch.append(self.contribution(start + step * i, f"contributor-{person}", f"team-{person % teams}"))
+            texts = [c for c in batch if c["type"] == "text"]
+            for c, stats in zip(texts, text_stats_batch(c["target_text"] for c in texts)):
+                c["word_count"] = stats.words
+                c["grapheme_count"] = stats.graphemes
+            done += len(batch)
+            yield batch
@@ -0,0 +1,67 @@
+"""Content-addressed storage for uploaded media.
+
+Files are stored once under their SHA-256 digest, sharded by the first two
+byte pairs of the digest (``ab/cd/abcd...``). Identical uploads map to the
+same blob, so contributions only need to keep the digest.
+"""
+import hashlib
+import os
+import tempfile
+
+CHUNK_SIZE = 1 << 20
+
+
+def _chunks(fileobj, chunk_size=CHUNK_SIZE):
+    """Yield the contents of ``fileobj`` in chunks without copying buffers."""
+    getbuffer = getattr(fileobj, "getbuffer", None)
+    if getbuffer is not None:
+        # In-memory uploads expose their buffer; slice views instead of reading copies
+        with getbuffer() as view:
+            for start in range(0, len(view), chunk_size):
+                yield view[start:start + chunk_size]
+        return
+    fileobj.seek(0)
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+class BlobStore:
+    def __init__(self, root, chunk_size=CHUNK_SIZE):
+        self.root = root
+        self.chunk_size = chunk_size
+        os.makedirs(os.path.join(root, "tmp"), exist_ok=True)
+
+    def path(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def put(self, fileobj):
+        """Store ``fileobj``; returns ``(digest, size, created)``.
+
+        ``created`` is False when an identical blob was already stored.
+        """
+        hasher = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.join(self.root, "tmp"))
+        try:
+            # Hash and spool in the same pass
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in _chunks(fileobj, self.chunk_size):
+                    hasher.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+            digest = hasher.hexdigest()
+            path = self.path(digest)
+            if os.path.exists(path):
+                return digest, size, False
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+            return digest, size, True
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,209 @@
+"""Bulk import of translation pairs and image descriptions from files.
+
+CSV, TSV and JSON Lines files are parsed as a stream. Rows are validated
+with the same rules as the contribution forms, turned into contributions
+in batches and committed one batch per transaction.
+"""
+import csv
+import io
+import json
+import os
+import uuid
+from collections import namedtuple
+from datetime import datetime
+
+from exporter import chunked
+from textstats import script_mismatches, text_stats_batch
+
+# Minimum lengths shared with the single-item contribution forms
+MIN_TEXT_LENGTH = 20
+MIN_DESCRIPTION_LENGTH = 30
+
+BATCH_SIZE = 2000
+MAX_REPORTED_ERRORS = 20
+
+FORMATS = {".csv": "csv", ".tsv": "tsv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+ImportResult = namedtuple("ImportResult", ["imported", "rejected", "duplicates", "errors"])
+
+
+class RowError(ValueError):
+    """A row that fails validation; the message is shown to the contributor."""
+
+
+def read_rows(fileobj, filename):
+    """Yield ``(line_number, row_dict)`` from a CSV, TSV or JSONL upload."""
+    fmt = FORMATS.get(os.path.splitext(filename)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Unsupported file type: {filename}")
+    fileobj.seek(0)
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "jsonl":
+            for line_number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, RowError(f"invalid JSON ({e.msg})")
+                    continue
+                yield line_number, row if isinstance(row, dict) else RowError("not a JSON object")
+        else:
+            reader = csv.DictReader(text, delimiter="\t" if fmt == "tsv" else ",")
+            for row in reader:
+                yield reader.line_num, row
+    finally:
+        # Leave the caller's file object open
+        text.detach()
+
+
+def _field(row, name, default=""):
+    value = row.get(name)
+    if value is None:
+        return default
+    # JSON Lines rows can hold numbers, lists or objects where text belongs
+    if not isinstance(value, str):
+        raise RowError(f"{name} must be a string")
+    _check_encodable(name, value)
+    return value.strip()
+
+
+def _check_encodable(name, value):
+    # JSON escapes can spell lone surrogates, which no later step can encode
+    try:
+        value.encode("utf-8")
+    except UnicodeEncodeError:
+        raise RowError(f"{name} is not valid Unicode text") from None
+
+
+def _tags(row):
+    tags = row.get("tags")
+    if tags is None:
+        return []
+    if isinstance(tags, str):
+        _check_encodable("tags", tags)
+        return [tag.strip() for tag in tags.split(",") if tag.strip()]
+    if isinstance(tags, list) and all(isinstance(tag, str) for tag in tags):
+        for tag in tags:
+            _check_encodable("tags", tag)
+        return tags
+    raise RowError("tags must be a comma-separated string or a list of strings")
+
+
+def text_row(row, defaults, languages):
+    source_text = _field(row, "source_text")
+    target_text = _field(row, "target_text")
+    target_language = _field(row, "target_language") or defaults["target_language"]
+    if target_language not in languages:
+        raise RowError(f"unknown target_language {target_language!r}")
+    return {
+        "type": "text",
+        "text_type": _field(row, "text_type") or defaults["text_type"],
+        "source_language": _field(row, "source_language") or defaults["source_language"],
+        "target_language": target_language,
+        "source_text": source_text,
+        "target_text": target_text,
+        "difficulty": _field(row, "difficulty") or "Basic/Everyday",
+        "context": _field(row, "context"),
+        "region": _field(row, "region") or "Standard",
+    }
+
+
+def image_row(row, defaults, languages):
+    description = _field(row, "description")
+    language = _field(row, "language") or defaults["language"]
+    if language not in languages:
+        raise RowError(f"unknown language {language!r}")
+    tags = _tags(row)
+    return {
+        "type": "image",
+        "category": _field(row, "category") or defaults["category"],
+        "language": language,
+        "description": description,
+        "cultural_significance": _field(row, "cultural_significance"),
+        "location": _field(row, "location"),
+        "tags": tags,
+        "filename": _field(row, "filename"),
+    }
+
+
+ROW_BUILDERS = {"text": text_row, "image": image_row}
+
+# Fields whose length is checked, counted in characters as the forms show
+# them (grapheme clusters), and the minimum they must exceed. Counted for
+# a whole batch at once after the rows are built.
+LENGTH_RULES = {
+    "text": (("source_text", "target_text"), MIN_TEXT_LENGTH),
+    "image": (("description",), MIN_DESCRIPTION_LENGTH),
+}
+
+
+def import_file(fileobj, filename, kind, store, contributor, contributor_name, team, defaults, languages,
+                is_duplicate=None, progress=None, batch_size=BATCH_SIZE):
+    """Validate and commit every row of ``fileobj`` as ``kind`` contributions.
+
+    Rows are stored under the stable ``contributor`` id, labelled with
+    ``contributor_name``.
+
+    ``is_duplicate(contribution)`` may reject rows before they are stored and
+    ``progress(fraction, imported, rejected)`` is called after each batch.
+    """
+    build = ROW_BUILDERS[kind]
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell() or 1
+    imported = rejected = duplicates = 0
+    errors = []
+
+    def reject(line_number, reason):
+        nonlocal rejected
+        rejected += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append((line_number, reason))
+
+    fields, min_length = LENGTH_RULES[kind]
+    too_short = f"{' and '.join(fields)} need{'s' if len(fields) == 1 else ''} more than {min_length} characters"
+
+    for batch in chunked(read_rows(fileobj, filename), batch_size):
+        built = []
+        for line_number, row in batch:
+            try:
+                if isinstance(row, RowError):
+                    raise row
+                built.append((line_number, build(row, defaults, languages)))
+            except RowError as e:
+                reject(line_number, str(e))
+
+        # Word and character counts for the whole batch in one pass per field
+        stats = {field: text_stats_batch(c[field] for _, c in built) for field in fields}
+
+        contributions = []
+        for i, (line_number, contribution) in enumerate(built):
+            if any(stats[field][i].graphemes <= min_length for field in fields):
+                reject(line_number, too_short)
+                continue
+            if kind == "text":
+                contribution["word_count"] = stats["target_text"][i].words
+                contribution["grapheme_count"] = stats["target_text"][i].graphemes
+            contribution.update({
+                "id": str(uuid.uuid4()),
+                "timestamp": datetime.now().isoformat(),
+                "contributor": contributor,
+                "contributor_name": contributor_name,
+                "team": team,
+            })
+            if is_duplicate is not None and is_duplicate(contribution):
+                duplicates += 1
+                continue
+            contributions.append(contribution)
+
+        # Rows whose text isn't in their language's script are kept but flagged
+        for contribution, _text_field, _check in script_mismatches(contributions):
+            contribution["quality_flags"] = ["script_mismatch"]
+
+        store.add_many(contributions)
+        imported += len(contributions)
+        if progress is not None:
+            progress(min(fileobj.tell() / size, 1.0), imported, rejected)
+
+    return ImportResult(imported, rejected, duplicates, errors)
@@ -0,0 +1,133 @@
+"""Languages, categories and prompts offered by the contribution forms.
+
+Kept apart from the Streamlit app so scripts such as the benchmarks can
+use the same catalog without starting a UI.
+"""
+
+LANGUAGES = {
+    "Hindi": {"name": "हिन्दी", "contributors": 156, "hours": 234.5},
+    "Tamil": {"name": "தமிழ்", "contributors": 143, "hours": 198.2},
+    "Telugu": {"name": "తెలుగు", "contributors": 98, "hours": 167.8},
+    "Bengali": {"name": "বাংলা", "contributors": 87, "hours": 145.3},
+    "Marathi": {"name": "मराठी", "contributors": 76, "hours": 134.7},
+    "Gujarati": {"name": "ગુજરાતી", "contributors": 65, "hours": 112.4},
+    "Kannada": {"name": "ಕನ್ನಡ", "contributors": 54, "hours": 98.6},
+    "Malayalam": {"name": "മലയാളം", "contributors": 43, "hours": 87.3},
+    "English": {"name": "English", "contributors": 57, "hours": 60}
+}
+
+# Select box options, built once per process rather than on every rerun
+LANGUAGE_NAMES = list(LANGUAGES)
+LANGUAGE_LABELS = [f"{lang} ({data['name']})" for lang, data in LANGUAGES.items()]
+SOURCE_LANGUAGES = ["English"] + LANGUAGE_NAMES
+
+AUDIO_CATEGORIES = [
+    "🗣️ Common Phrases",
+    "🔢 Numbers & Counting",
+    "💬 Daily Conversations",
+    "📚 Stories & Literature",
+    "🎵 Songs & Poetry",
+    "📰 News Reading",
+    "🏛️ Cultural Content",
+    "🎓 Educational Content"
+]
+
+# Recording length choices and the hours each one counts for
+AUDIO_DURATIONS = {
+    "2-3 minutes": 0.04,  # 2.5 minutes = 0.04 hours
+    "3-5 minutes": 0.07,  # 4 minutes = 0.07 hours
+    "5-10 minutes": 0.12, # 7.5 minutes = 0.12 hours
+    "10+ minutes": 0.25   # 15 minutes = 0.25 hours
+}
+
+AUDIO_QUALITIES = ["High (Studio)", "Medium (Quiet room)", "Basic (Normal)"]
+
+AUDIO_PROMPTS = {
+    "🗣️ Common Phrases": [
+        "Introduce yourself and your background",
+        "Describe your daily routine",
+        "Talk about your family and hometown",
+        "Share your favorite memories"
+    ],
+    "🔢 Numbers & Counting": [
+        "Count from 1 to 100",
+        "Say important years and dates",
+        "Describe quantities and measurements",
+        "Read phone numbers and addresses"
+    ],
+    "💬 Daily Conversations": [
+        "Order food at a restaurant",
+        "Ask for directions",
+        "Shopping conversation",
+        "Doctor visit conversation"
+    ],
+    "📚 Stories & Literature": [
+        "Tell a folk tale from your region",
+        "Recite a famous poem",
+        "Share a moral story",
+        "Describe local legends"
+    ]
+}
+
+VIDEO_TYPES = [
+    "👋 Sign Language & Gestures",
+    "🎭 Cultural Performances",
+    "🍳 Cooking Instructions",
+    "🏛️ Monument & Place Descriptions",
+    "📖 Story Telling with Visuals",
+    "🎓 Educational Explanations",
+    "🎨 Art & Craft Tutorials"
+]
+
+VIDEO_DURATIONS = {
+    "5-10 minutes": 0.12,  # 7.5 minutes = 0.12 hours
+    "10-15 minutes": 0.21, # 12.5 minutes = 0.21 hours
+    "15-20 minutes": 0.29, # 17.5 minutes = 0.29 hours
+    "20+ minutes": 0.42    # 25 minutes = 0.42 hours
+}
+
+VIDEO_SETTINGS = ["Indoor/Studio", "Outdoor/Natural", "Cultural Location", "Educational Setup"]
+
+VIDEO_PROMPTS = {
+    "👋 Sign Language & Gestures": [
+        "Demonstrate common gestures in your culture",
+        "Show traditional greeting styles",
+        "Express emotions through gestures"
+    ],
+    "🎭 Cultural Performances": [
+        "Perform a traditional dance",
+        "Sing a folk song",
+        "Demonstrate cultural rituals"
+    ],
+    "🍳 Cooking Instructions": [
+        "Cook a traditional dish step-by-step",
+        "Explain ingredients in local language",
+        "Share family recipes"
+    ]
+}
+
+TEXT_TYPES = [
+    "🌐 Translation Pairs",
+    "📚 Literature & Poetry",
+    "📰 News & Articles",
+    "💬 Conversational Data",
+    "🏛️ Cultural Content",
+    "🎓 Educational Material",
+    "📱 Social Media Style",
+    "📧 Formal Communications"
+]
+
+DIFFICULTIES = ["Basic/Everyday", "Intermediate", "Advanced/Technical"]
+
+REGIONS = ["Standard", "Northern", "Southern", "Eastern", "Western", "Central"]
+
+IMAGE_CATEGORIES = [
+    "🏛️ Cultural Heritage",
+    "🍽️ Food & Cuisine",
+    "🎭 Festivals & Celebrations",
+    "🏞️ Landscapes & Places",
+    "👥 People & Portraits",
+    "📚 Documents & Text",
+    "🎨 Art & Crafts",
+    "📱 Modern Life"
+]
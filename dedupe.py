@@ -0,0 +1,146 @@
+"""Near-duplicate detection for translation pairs.
+
+Each pair is reduced to a MinHash signature over character shingles of its
+normalized source and target text. Signatures are split into LSH bands, so
+a lookup only compares against pairs that share at least one band bucket
+instead of the whole corpus.
+"""
+import re
+import threading
+import unicodedata
+import zlib
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 4
+THRESHOLD = 0.8
+
+# Fixed seed so signatures are comparable across processes and restarts
+_rng = np.random.default_rng(20240501)
+_A = _rng.integers(1, 2 ** 63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64)
+
+_SPACE = re.compile(r"\s+")
+
+
+def normalize(text):
+    return _SPACE.sub(" ", unicodedata.normalize("NFC", text).casefold()).strip()
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    text = normalize(text)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def signature(source_text, target_text):
+    """MinHash signature (``NUM_PERM`` uint32 values) of a translation pair."""
+    # Mark which side a shingle came from so swapped pairs don't collide
+    grams = {"s" + g for g in shingles(source_text)} | {"t" + g for g in shingles(target_text)}
+    if not grams:
+        return None
+    hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+    # Multiply-shift hashing: one row per permutation, overflow wraps mod 2**64
+    permuted = (_A[:, None] * hashes[None, :] + _B[:, None]) >> np.uint64(32)
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+
+def _band_keys(sig):
+    return [(band, sig[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+
+
+class MinHashIndex:
+    """Per-language LSH index of translation-pair signatures."""
+
+    def __init__(self, threshold=THRESHOLD):
+        self.threshold = threshold
+        self._signatures = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_store(cls, store):
+        index = cls()
+        store.follow(index.append_entries)
+        return index
+
+    def append_entries(self, entries):
+        with self._lock:
+            self._append(entries)
+
+    def _append(self, entries):
+        for seq, language, contribution in entries:
+            if contribution["type"] != "text":
+                continue
+            sig = signature(contribution.get("source_text", ""), contribution.get("target_text", ""))
+            if sig is not None:
+                self._add(contribution["id"], language, sig)
+
+    def _add(self, key, language, sig):
+        self._signatures[key] = sig
+        for band_key in _band_keys(sig):
+            self._buckets.setdefault((language, band_key), []).append(key)
+
+    def _match(self, language, sig):
+        best_key, best = None, 0.0
+        seen = set()
+        for band_key in _band_keys(sig):
+            for key in self._buckets.get((language, band_key), ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                score = similarity(sig, self._signatures[key])
+                if score > best:
+                    best_key, best = key, score
+        if best >= self.threshold:
+            return best_key, best
+        return None
+
+    def query(self, language, source_text, target_text):
+        """Return ``(contribution_id, similarity)`` of the closest near-duplicate, or None."""
+        sig = signature(source_text, target_text)
+        if sig is None:
+            return None
+        with self._lock:
+            return self._match(language, sig)
+
+    def check_and_add(self, key, language, source_text, target_text):
+        """Like ``query``, but index the pair under ``key`` when it is new."""
+        sig = signature(source_text, target_text)
+        if sig is None:
+            return None
+        with self._lock:
+            match = self._match(language, sig)
+            if match is None:
+                self._add(key, language, sig)
+            return match
+
+    def __len__(self):
+        return len(self._signatures)
+
+
+def drop_near_duplicates(records, threshold=THRESHOLD):
+    """Yield ``records`` in order, skipping text pairs that repeat an earlier one.
+
+    Runs in a single pass with its own index, so it can dedupe a whole
+    corpus while it is streamed out for export.
+    """
+    index = MinHashIndex(threshold)
+    for record in records:
+        if record.get("type") == "text" and index.check_and_add(
+            record["id"],
+            record.get("target_language"),
+            record.get("source_text", ""),
+            record.get("target_text", ""),
+        ):
+            continue
+        yield record
@@ -0,0 +1,204 @@
+"""Streaming export of contributions.
+
+Records are pulled from the store iterator and written out in fixed-size
+chunks, so peak memory depends on the chunk size rather than the size of
+the corpus.
+"""
+import csv
+import hashlib
+import io
+import json
+import os
+import secrets
+from itertools import islice
+
+EXPORT_DIR = os.environ.get("BHASHA_EXPORT_DIR", os.path.join("data", "exports"))
+
+# Union of the fields written by the audio, video, text and image forms
+EXPORT_COLUMNS = [
+    "id", "type", "language", "source_language", "target_language",
+    "category", "text_type", "video_type", "prompt", "duration",
+    "duration_hours", "quality", "setting", "difficulty", "region",
+    "word_count", "grapheme_count", "source_text", "target_text", "context",
+    "description", "cultural_significance", "location", "tags", "filename",
+    "file_size", "blob_sha256", "duration_seconds", "sample_rate", "channels",
+    "rms_dbfs", "peak_dbfs", "snr_db", "clipping_ratio", "silence_ratio",
+    "quality_flags", "timestamp", "contributor", "team",
+]
+
+# Fields kept when detailed metadata is not requested
+ESSENTIAL_COLUMNS = ["id", "type", "language", "timestamp"]
+
+NUMERIC_COLUMNS = {
+    "duration_hours": "float", "word_count": "int", "grapheme_count": "int", "file_size": "int",
+    "duration_seconds": "float", "sample_rate": "int", "channels": "int", "rms_dbfs": "float",
+    "peak_dbfs": "float", "snr_db": "float", "clipping_ratio": "float", "silence_ratio": "float",
+}
+LIST_COLUMNS = {"tags", "quality_flags"}
+
+# Export choices offered on the export page: label -> (format, extension, mime)
+EXPORT_FORMATS = {
+    "CSV (Recommended)": ("csv", "csv", "text/csv"),
+    "JSON Lines": ("ndjson", "jsonl", "application/x-ndjson"),
+    "Parquet": ("parquet", "parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+CHUNK_SIZE = 1000
+
+# Fields the near-duplicate filter compares text pairs on
+DEDUPE_FIELDS = ["id", "type", "source_text", "target_text", "target_language"]
+
+
+def chunked(records, size=CHUNK_SIZE):
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _flat(value):
+    # Spreadsheet-style formats hold scalars only
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def write_csv(records, out, columns, chunk_size=CHUNK_SIZE):
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=True)
+    writer = csv.writer(text)
+    writer.writerow(columns)
+    for chunk in chunked(records, chunk_size):
+        writer.writerows([[_flat(r.get(c, "")) for c in columns] for r in chunk])
+    text.flush()
+    text.detach()
+
+
+def write_ndjson(records, out, columns, chunk_size=CHUNK_SIZE):
+    for chunk in chunked(records, chunk_size):
+        lines = [
+            json.dumps({c: r[c] for c in columns if c in r}, ensure_ascii=False, default=str)
+            for r in chunk
+        ]
+        out.write(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+def write_parquet(records, out, columns, chunk_size=CHUNK_SIZE):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"float": pa.float64(), "int": pa.int64()}
+    schema = pa.schema([
+        (c, pa.list_(pa.string()) if c in LIST_COLUMNS else types.get(NUMERIC_COLUMNS.get(c), pa.string()))
+        for c in columns
+    ])
+    # Each chunk becomes one row group
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in chunked(records, chunk_size):
+            rows = [{c: r.get(c) for c in columns} for r in chunk]
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+
+
+def write_xlsx(records, out, columns, chunk_size=CHUNK_SIZE):
+    from openpyxl import Workbook
+
+    # Write-only workbooks stream rows to disk instead of keeping cells in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("contributions")
+    sheet.append(columns)
+    for chunk in chunked(records, chunk_size):
+        for r in chunk:
+            sheet.append([_flat(r.get(c)) for c in columns])
+    workbook.save(out)
+
+
+WRITERS = {
+    "csv": write_csv,
+    "ndjson": write_ndjson,
+    "parquet": write_parquet,
+    "xlsx": write_xlsx,
+}
+
+
+class CountingIterator:
+    """Wraps a record iterator and counts what passes through it."""
+
+    def __init__(self, records):
+        self._records = iter(records)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        record = next(self._records)
+        self.count += 1
+        return record
+
+
+def write_export(records, path, fmt, columns=None, chunk_size=CHUNK_SIZE):
+    """Stream ``records`` to ``path`` in format ``fmt``; returns the record count."""
+    if fmt not in WRITERS:
+        raise ValueError(f"Unsupported export format {fmt!r}")
+    records = CountingIterator(records)
+    with open(path, "wb") as out:
+        WRITERS[fmt](records, out, columns or EXPORT_COLUMNS, chunk_size)
+    return records.count
+
+
+def anonymize(field="contributor", value="Anonymous"):
+    """Transform replacing ``field`` with a fixed placeholder."""
+    def transform(record):
+        return {**record, field: value} if field in record else record
+    transform.fields = [field]
+    return transform
+
+
+def hash_ids(field="contributor", salt=None):
+    """Transform replacing ``field`` with a salted hash.
+
+    The same contributor gets the same pseudonym throughout one export, so
+    per-speaker splits still work, but the name can't be read back. Set
+    ``BHASHA_EXPORT_SALT`` to keep pseudonyms stable across exports.
+    """
+    if salt is None:
+        salt = os.environ.get("BHASHA_EXPORT_SALT") or secrets.token_hex(16)
+    salt = salt.encode("utf-8")
+    pseudonyms = {}
+
+    def transform(record):
+        value = record.get(field)
+        if value is None:
+            return record
+        if value not in pseudonyms:
+            digest = hashlib.sha256(salt + str(value).encode("utf-8")).hexdigest()
+            pseudonyms[value] = "anon-" + digest[:16]
+        return {**record, field: pseudonyms[value]}
+    transform.fields = [field]
+    return transform
+
+
+class ExportView:
+    """Lazy view of a record stream for export.
+
+    ``fields`` lists what the store has to load: the exported ``columns``
+    plus whatever the transforms and ``extra_fields`` read. Transforms
+    run as records are pulled and return new dicts, so the store's
+    records are never copied up front or modified.
+    """
+
+    def __init__(self, columns, transforms=(), extra_fields=()):
+        self.columns = list(columns)
+        self.transforms = list(transforms)
+        needed = [*self.columns, *extra_fields]
+        for transform in self.transforms:
+            needed.extend(getattr(transform, "fields", ()))
+        self.fields = list(dict.fromkeys(needed))
+
+    def __call__(self, records):
+        for record in records:
+            for transform in self.transforms:
+                record = transform(record)
+            yield record
@@ -0,0 +1,45 @@
+"""Process-wide cache of built chart figures.
+
+Each figure is stored under a name together with the data version it was
+built from. A lookup with the same version reuses the figure; a newer
+version rebuilds it. The least recently used figures are evicted once the
+cache holds ``maxsize`` of them.
+"""
+import threading
+from collections import OrderedDict
+
+
+class FigureCache:
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name, version, build):
+        """Return the figure ``name`` for ``version``, calling ``build()`` if stale."""
+        with self._lock:
+            cached = self._figures.get(name)
+            if cached is not None and cached[0] == version:
+                self._figures.move_to_end(name)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        # Build outside the lock so slow figures don't block other sessions
+        figure = build()
+
+        with self._lock:
+            self._figures[name] = (version, figure)
+            self._figures.move_to_end(name)
+            while len(self._figures) > self.maxsize:
+                self._figures.popitem(last=False)
+        return figure
+
+    def __len__(self):
+        return len(self._figures)
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
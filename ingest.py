@@ -0,0 +1,125 @@
+"""Background processing of media submissions.
+
+Recording submissions are queued on a shared worker pool instead of being
+processed on the Streamlit script thread. Each job reports its progress so
+pages can poll it, and the contribution is committed to the store once the
+job finishes.
+"""
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class IngestQueueFull(Exception):
+    """Raised when the ingest queue has no free slots."""
+
+
+class IngestJob:
+    def __init__(self, contribution):
+        self.id = str(uuid.uuid4())
+        self.contribution = contribution
+        self.status = QUEUED
+        self.progress = 0.0
+        self.error = None
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+
+def media_processor(seconds, steps=100):
+    """Stand-in for capture/transcoding that takes ``seconds`` and reports progress."""
+    def process(job):
+        for i in range(steps):
+            time.sleep(seconds / steps)
+            job.progress = (i + 1) / steps
+        return job.contribution
+    return process
+
+
+class IngestPool:
+    """Bounded worker pool that processes jobs and commits their results.
+
+    At most ``max_pending`` jobs may be queued or running at once; further
+    submissions wait up to ``timeout`` seconds for a slot and then raise
+    ``IngestQueueFull``. Results are committed with ``store.add``, so a
+    ``WriteQueue`` can stand in for the store to batch them with other writes.
+
+    With a ``journal``, each contribution is kept in its ``pending`` table
+    until the job finishes, so work cut short by a restart can be resumed.
+    """
+
+    def __init__(self, store, workers=None, max_pending=64, keep_finished=1000, journal=None):
+        self.store = store
+        self.journal = journal
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or min(32, (os.cpu_count() or 1) + 4),
+            thread_name_prefix="ingest",
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._keep_finished = keep_finished
+
+    def submit(self, contribution, process, timeout=5):
+        if not self._slots.acquire(timeout=timeout):
+            raise IngestQueueFull("Too many submissions are being processed")
+        job = IngestJob(contribution)
+        if self.journal is not None:
+            self.journal.put("pending", contribution["id"], contribution)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, process)
+        return job.id
+
+    def _run(self, job, process):
+        job.status = RUNNING
+        try:
+            contribution = process(job)
+            self.store.add(contribution)
+            job.contribution = contribution
+            job.progress = 1.0
+            job.status = DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            if self.journal is not None:
+                self.journal.delete("pending", job.contribution["id"])
+            self._slots.release()
+
+    def _prune(self):
+        # Forget the oldest finished jobs once too many have piled up
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self._keep_finished)]:
+            del self._jobs[job_id]
+
+    def resume(self, processor):
+        """Resubmit journaled contributions that never reached the store.
+
+        ``processor(contribution)`` returns the process step for each one.
+        """
+        if self.journal is None:
+            return []
+        job_ids = []
+        for contribution_id, contribution in self.journal.items("pending"):
+            if self.store.get(contribution_id) is not None:
+                # Committed just before the restart; only the journal lagged
+                self.journal.delete("pending", contribution_id)
+                continue
+            job_ids.append(self.submit(contribution, processor(contribution)))
+        return job_ids
+
+    def job(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self, wait=True):
+        """Stop taking jobs and, with ``wait``, let the running ones commit."""
+        self._executor.shutdown(wait=wait)
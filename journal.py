@@ -0,0 +1,179 @@
+"""Crash-safe journal for the small amount of state that lives outside the store.
+
+Contributions and the counters derived from them are committed to the
+store. What a restart would otherwise lose is the state around them:
+
+- which contributor and team a browser tab was working as
+- recordings still being processed on the ingest pool
+
+The journal keeps that state as ``table -> key -> value`` in memory and
+appends every change to a log file. Each record is framed as
+
+    <payload length: uint32 LE> <CRC-32 of payload: uint32 LE> <payload>
+
+where the payload is compact JSON ``[table, key, value]``; a ``None``
+value deletes the key. A torn or corrupt tail fails its length or CRC
+check on replay and is cut off.
+
+Appends reach the OS immediately, but a background thread fsyncs at most
+every ``fsync_interval`` seconds, so a burst of changes shares one fsync
+and nothing waits on the disk. Once ``snapshot_every`` records have been
+appended, the whole state is written to a snapshot (a single frame) and
+the log starts over. Only serializing the state holds the journal's lock;
+the log is rotated aside so appends carry on in a fresh one while the
+snapshot is written and fsynced. Replaying a snapshot plus the log tail
+is what a restart costs; reads after that are dict lookups.
+"""
+import json
+import os
+import struct
+import threading
+import zlib
+
+HEADER = struct.Struct("<II")
+LOG = "journal.log"
+# The log being folded into a snapshot; only left behind by a crash mid-snapshot
+OLD_LOG = LOG + ".old"
+SNAPSHOT = "snapshot.bin"
+
+
+def _frame(value):
+    payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    return HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_frames(path):
+    """Yield ``(end_offset, value)`` for each intact frame in ``path``, stopping at the first bad one."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        offset = 0
+        while True:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return
+            length, crc = HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                return
+            offset += HEADER.size + length
+            yield offset, json.loads(payload)
+
+
+class Journal:
+    def __init__(self, directory, fsync_interval=0.05, snapshot_every=10000):
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.fsyncs = 0
+        self.snapshots = 0
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._tables = {}
+        self._appended = 0
+        self._dirty = False
+        self._closed = threading.Event()
+        self._load()
+        if os.path.exists(os.path.join(directory, OLD_LOG)):
+            # Finish the interrupted snapshot before the next one rotates the log again
+            self._write_snapshot(_frame(self._tables))
+            open(os.path.join(directory, LOG), "wb").close()
+            os.remove(os.path.join(directory, OLD_LOG))
+            self._appended = 0
+        self._log = open(os.path.join(directory, LOG), "ab", buffering=0)
+        self._thread = threading.Thread(target=self._run, name="journal", daemon=True)
+        self._thread.start()
+
+    def _load(self):
+        for _, tables in read_frames(os.path.join(self.directory, SNAPSHOT)):
+            self._tables = tables
+        for _, (table, key, value) in read_frames(os.path.join(self.directory, OLD_LOG)):
+            self._apply(table, key, value)
+        log_path = os.path.join(self.directory, LOG)
+        good = 0
+        for good, (table, key, value) in read_frames(log_path):
+            self._apply(table, key, value)
+            self._appended += 1
+        if os.path.exists(log_path) and os.path.getsize(log_path) > good:
+            # Drop a torn tail so new records don't land after garbage
+            with open(log_path, "r+b") as f:
+                f.truncate(good)
+
+    def _apply(self, table, key, value):
+        if value is None:
+            self._tables.get(table, {}).pop(key, None)
+        else:
+            self._tables.setdefault(table, {})[key] = value
+
+    def put(self, table, key, value):
+        """Record ``table[key] = value``; durable within ``fsync_interval`` seconds."""
+        frame = _frame([table, key, value])
+        with self._lock:
+            self._log.write(frame)
+            self._apply(table, key, value)
+            self._appended += 1
+            self._dirty = True
+
+    def delete(self, table, key):
+        self.put(table, key, None)
+
+    def get(self, table, key, default=None):
+        with self._lock:
+            return self._tables.get(table, {}).get(key, default)
+
+    def items(self, table):
+        with self._lock:
+            return list(self._tables.get(table, {}).items())
+
+    def sync(self):
+        """fsync everything appended so far."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            log = self._log
+        # Outside the lock so puts never wait on the disk
+        os.fsync(log.fileno())
+        self.fsyncs += 1
+
+    def snapshot(self):
+        """Write the whole state to the snapshot and start an empty log."""
+        log_path = os.path.join(self.directory, LOG)
+        old_path = os.path.join(self.directory, OLD_LOG)
+        with self._lock:
+            frame = _frame(self._tables)
+            old_log = self._log
+            # Puts from here on go to a fresh log that the snapshot doesn't cover
+            os.replace(log_path, old_path)
+            self._log = open(log_path, "ab", buffering=0)
+            self._appended = 0
+            self._dirty = False
+        old_log.close()
+        # The snapshot is durable before the log it replaces is removed;
+        # replaying an old log over a newer snapshot is harmless as every
+        # record is an idempotent put
+        self._write_snapshot(frame)
+        os.remove(old_path)
+        self.snapshots += 1
+
+    def _write_snapshot(self, frame):
+        tmp_path = os.path.join(self.directory, SNAPSHOT + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(frame)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.directory, SNAPSHOT))
+
+    def _run(self):
+        while not self._closed.wait(self.fsync_interval):
+            self.sync()
+            if self._appended >= self.snapshot_every:
+                self.snapshot()
+
+    def close(self):
+        self._closed.set()
+        self._thread.join()
+        self.sync()
+        self._log.close()
@@ -0,0 +1,99 @@
+"""Live team totals and ranking.
+
+Team totals are updated from store listeners on every write, and a list of
+``(-score, team)`` keys is kept sorted alongside them. Rank lookups are a
+bisect and top-N is a slice, so pages never re-sort every team.
+"""
+import threading
+from bisect import bisect_left, insort
+
+AUDIO_VIDEO_GOAL = 80
+TEXT_IMAGE_GOAL = 800
+
+
+class TeamStats:
+    def __init__(self, name):
+        self.name = name
+        self.audio = 0.0
+        self.video = 0.0
+        self.text = 0
+        self.images = 0
+        self.members = set()
+        self.languages = set()
+
+    @property
+    def hours(self):
+        return self.audio + self.video
+
+    @property
+    def records(self):
+        return self.text + self.images
+
+    @property
+    def score(self):
+        # Out of 100, equal weight on the hours and records goals
+        return (self.hours / AUDIO_VIDEO_GOAL + self.records / TEXT_IMAGE_GOAL) * 50
+
+    def add(self, contribution, language):
+        kind = contribution["type"]
+        hours = float(contribution.get("duration_hours") or 0)
+        if kind == "audio":
+            self.audio += hours
+        elif kind == "video":
+            self.video += hours
+        elif kind == "text":
+            self.text += 1
+        elif kind == "image":
+            self.images += 1
+        if contribution.get("contributor"):
+            self.members.add(contribution["contributor"])
+        if language:
+            self.languages.add(language)
+
+
+class TeamLeaderboard:
+    def __init__(self):
+        self.teams = {}
+        self._ranking = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_store(cls, store):
+        board = cls()
+        store.follow(board.append_entries)
+        return board
+
+    def append_entries(self, entries):
+        with self._lock:
+            self._append(entries)
+
+    def _append(self, entries):
+        for seq, language, contribution in entries:
+            team = contribution.get("team")
+            if not team:
+                continue
+            stats = self.teams.get(team)
+            if stats is None:
+                stats = self.teams[team] = TeamStats(team)
+            else:
+                # Drop the old ranking key before the score changes
+                del self._ranking[bisect_left(self._ranking, (-stats.score, team))]
+            stats.add(contribution, language)
+            insort(self._ranking, (-stats.score, team))
+
+    def __len__(self):
+        return len(self.teams)
+
+    def top(self, n=None):
+        """The ``n`` best teams (all when ``n`` is None), highest score first."""
+        with self._lock:
+            keys = self._ranking if n is None else self._ranking[:n]
+            return [self.teams[team] for _, team in keys]
+
+    def rank(self, team):
+        """1-based rank of ``team``, or None if it has no contributions."""
+        with self._lock:
+            stats = self.teams.get(team)
+            if stats is None:
+                return None
+            return bisect_left(self._ranking, (-stats.score, team)) + 1
@@ -0,0 +1,164 @@
+"""Lightweight timing of page renders and other hot paths.
+
+Blocks are timed with ``timed(name)`` or the ``profiled(name)`` decorator.
+Each block's calls, wall time and memory delta are folded into per-name
+totals. The most recent samples are also kept so they can be dumped as
+JSON lines or as Prometheus text for offline analysis.
+
+Memory deltas use tracemalloc when it is tracing (allocated bytes) and the
+process RSS otherwise, which is cheap but coarse.
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+MAX_SAMPLES = 5000
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def memory_usage():
+    """Traced bytes if tracemalloc is running, else resident set size (None if unknown)."""
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class BlockStats:
+    __slots__ = ("calls", "seconds", "max_seconds", "last_seconds", "memory", "allocated", "freed")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_seconds = 0.0
+        self.memory = 0
+        # Growth and shrinkage kept apart, so both only ever go up
+        self.allocated = 0
+        self.freed = 0
+
+    def add(self, seconds, memory):
+        self.calls += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.last_seconds = seconds
+        self.memory += memory or 0
+        if memory and memory > 0:
+            self.allocated += memory
+        elif memory:
+            self.freed -= memory
+
+
+class Profiler:
+    def __init__(self, max_samples=MAX_SAMPLES):
+        self.reruns = 0
+        self.blocks = {}
+        self.samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def rerun(self):
+        with self._lock:
+            self.reruns += 1
+
+    def record(self, name, seconds, memory=None):
+        with self._lock:
+            stats = self.blocks.get(name)
+            if stats is None:
+                stats = self.blocks[name] = BlockStats()
+            stats.add(seconds, memory)
+            self.samples.append((time.time(), name, seconds, memory, self.reruns))
+
+    @contextmanager
+    def timed(self, name):
+        before = memory_usage()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            after = memory_usage()
+            self.record(name, seconds, after - before if before is not None and after is not None else None)
+
+    def profiled(self, name):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timed(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """Per-block totals as a list of dicts, slowest total first."""
+        with self._lock:
+            rows = [
+                {
+                    "block": name,
+                    "calls": s.calls,
+                    "total_ms": s.seconds * 1000,
+                    "mean_ms": s.seconds / s.calls * 1000,
+                    "max_ms": s.max_seconds * 1000,
+                    "last_ms": s.last_seconds * 1000,
+                    "memory_bytes": s.memory,
+                }
+                for name, s in self.blocks.items()
+            ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self.reruns = 0
+            self.blocks.clear()
+            self.samples.clear()
+
+    def to_jsonl(self):
+        with self._lock:
+            samples = list(self.samples)
+        return "".join(
+            json.dumps({"time": t, "block": name, "seconds": seconds, "memory_bytes": memory, "rerun": rerun}) + "\n"
+            for t, name, seconds, memory, rerun in samples
+        )
+
+    def to_prometheus(self, prefix="bhasha"):
+        with self._lock:
+            reruns = self.reruns
+            blocks = sorted(self.blocks.items())
+        lines = [
+            f"# HELP {prefix}_reruns_total Script reruns since the profiler was reset.",
+            f"# TYPE {prefix}_reruns_total counter",
+            f"{prefix}_reruns_total {reruns}",
+        ]
+        metrics = [
+            ("block_calls_total", "counter", "Times each block ran.", lambda s: s.calls),
+            ("block_seconds_total", "counter", "Wall time spent in each block.", lambda s: s.seconds),
+            ("block_seconds_max", "gauge", "Slowest single run of each block.", lambda s: s.max_seconds),
+            ("block_memory_allocated_bytes_total", "counter", "Summed memory growth of each block.",
+             lambda s: s.allocated),
+            ("block_memory_freed_bytes_total", "counter", "Summed memory shrinkage of each block.",
+             lambda s: s.freed),
+        ]
+        for metric, kind, help_text, value in metrics:
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} {kind}")
+            for name, stats in blocks:
+                label = name.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{prefix}_{metric}{{block="{label}"}} {value(stats)}')
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide profiler shared by every session
+profiler = Profiler()
+timed = profiler.timed
+profiled = profiler.profiled
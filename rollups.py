@@ -0,0 +1,94 @@
+"""Aggregate counters maintained alongside the contribution store.
+
+Every write bumps a handful of counters (per type, language and
+contributor, each both corpus-wide and per contributor) in the same
+transaction, so dashboards read precomputed totals instead of rescanning
+history. Per-day counts live in the time series (see ``timeseries``).
+"""
+from collections import namedtuple
+
+# Scopes of the counters; corpus-wide ones have an empty name
+CORPUS, CONTRIBUTOR = "corpus", "contributor"
+
+# The scope column keeps any contributor name, even an empty one, from
+# colliding with the corpus-wide counters
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollup_counters (
+    scope TEXT NOT NULL,
+    name TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    records INTEGER NOT NULL DEFAULT 0,
+    hours REAL NOT NULL DEFAULT 0,
+    words INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, name, dimension, key)
+) WITHOUT ROWID;
+"""
+
+Rollup = namedtuple("Rollup", ["records", "hours", "words"])
+EMPTY = Rollup(0, 0.0, 0)
+
+
+def rollup_keys(contributor, language, contribution):
+    """Yield the (scope, name, dimension, key) counters one contribution feeds."""
+    keys = [
+        ("total", ""),
+        ("type", contribution["type"]),
+        ("language", language or "Unknown"),
+    ]
+    for dimension, key in keys:
+        yield CORPUS, "", dimension, key
+        if contributor is not None:
+            yield CONTRIBUTOR, contributor, dimension, key
+    if contributor is not None:
+        yield CORPUS, "", "contributor", contributor
+
+
+class Rollups:
+    """Counters kept in the ``rollup_counters`` table of a SQLite store."""
+
+    table = "rollup_counters"
+    schema = SCHEMA
+
+    def __init__(self, store):
+        self.store = store
+
+    def apply(self, conn, entries):
+        # Fold the batch in memory first so each counter is written once
+        deltas = {}
+        for _seq, language, contribution in entries:
+            hours = float(contribution.get("duration_hours") or 0)
+            words = int(contribution.get("word_count") or 0)
+            for key in rollup_keys(contribution.get("contributor"), language, contribution):
+                records, h, w = deltas.get(key, EMPTY)
+                deltas[key] = Rollup(records + 1, h + hours, w + words)
+        conn.executemany(
+            "INSERT INTO rollup_counters (scope, name, dimension, key, records, hours, words) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (scope, name, dimension, key) DO UPDATE SET "
+            "records = records + excluded.records, "
+            "hours = hours + excluded.hours, "
+            "words = words + excluded.words",
+            [key + tuple(delta) for key, delta in deltas.items()],
+        )
+
+    @staticmethod
+    def _scope(contributor):
+        # Only None means the whole corpus; any name, even "", is one contributor
+        return (CORPUS, "") if contributor is None else (CONTRIBUTOR, contributor)
+
+    def totals(self, contributor=None):
+        row = self.store.connection().execute(
+            "SELECT records, hours, words FROM rollup_counters "
+            "WHERE scope = ? AND name = ? AND dimension = 'total' AND key = ''",
+            self._scope(contributor),
+        ).fetchone()
+        return Rollup(*row) if row else EMPTY
+
+    def breakdown(self, dimension, contributor=None):
+        rows = self.store.connection().execute(
+            "SELECT key, records, hours, words FROM rollup_counters "
+            "WHERE scope = ? AND name = ? AND dimension = ? ORDER BY key",
+            (*self._scope(contributor), dimension),
+        ).fetchall()
+        return {key: Rollup(records, hours, words) for key, records, hours, words in rows}
@@ -0,0 +1,149 @@
+"""Full-text search over contributions.
+
+An inverted index of ``(term, seq)`` postings is kept in the store's
+database and updated in the same transaction as every insert. Terms come
+from the script-aware tokenizer in ``textstats``, so Indic words keep their
+vowel signs and conjuncts. Results are returned newest first and paged by
+sequence number, so each page is an index range scan no matter how deep
+the user pages.
+"""
+import json
+import unicodedata
+
+from textstats import ZWJ, ZWNJ, words, words_batch
+
+SEARCH_FIELDS = ("source_text", "target_text", "description", "cultural_significance", "tags", "prompt")
+
+# Longer tokens are almost always junk (URLs, base64) and would bloat the index
+MAX_TERM_LENGTH = 64
+
+# Sorts after every term sharing a prefix
+PREFIX_END = "\U0010ffff"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (term, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_seq ON postings(seq, term);
+"""
+
+_JOINERS = {ZWNJ: None, ZWJ: None}
+
+
+def normalize(text):
+    # Joiners only change how a word renders, not which word it is
+    return unicodedata.normalize("NFC", text).casefold().translate(_JOINERS)
+
+
+def _searchable(contribution):
+    # Every searchable field of a contribution as one text
+    parts = []
+    for field in SEARCH_FIELDS:
+        value = contribution.get(field)
+        if not value:
+            continue
+        if isinstance(value, (list, tuple)):
+            value = " ".join(str(v) for v in value)
+        parts.append(str(value))
+    return normalize(" ".join(parts))
+
+
+def document_terms_batch(contributions):
+    """Return the set of index terms of each contribution, tokenized in one pass."""
+    return [
+        {t for t in tokens if len(t) <= MAX_TERM_LENGTH}
+        for tokens in words_batch(_searchable(c) for c in contributions)
+    ]
+
+
+def document_terms(contribution):
+    return document_terms_batch([contribution])[0]
+
+
+def parse_query(query):
+    """Return ``(term, is_prefix)`` pairs; a trailing ``*`` makes a prefix query."""
+    parsed = []
+    for part in query.split():
+        tokens = words(normalize(part))
+        if not tokens:
+            continue
+        parsed.extend((token, False) for token in tokens[:-1])
+        parsed.append((tokens[-1], part.endswith("*")))
+    return parsed
+
+
+def _term_clause(alias, term, prefix):
+    if prefix:
+        return f"{alias}.term >= ? AND {alias}.term < ?", [term, term + PREFIX_END]
+    return f"{alias}.term = ?", [term]
+
+
+class SearchIndex:
+    """Postings kept in the ``postings`` table of a SQLite store."""
+
+    table = "postings"
+    schema = SCHEMA
+
+    def __init__(self, store):
+        self.store = store
+
+    def apply(self, conn, entries):
+        found = document_terms_batch(contribution for _seq, _language, contribution in entries)
+        conn.executemany(
+            "INSERT OR IGNORE INTO postings (term, seq) VALUES (?, ?)",
+            [(term, seq) for (seq, _language, _contribution), terms in zip(entries, found) for term in terms],
+        )
+
+    def search(self, query, type=None, contributor=None, limit=20, before=None):
+        """Return up to ``limit`` ``(seq, contribution)`` matching every query term.
+
+        ``type`` and ``contributor`` narrow the results like they do for
+        ``page()``. Pass the last ``seq`` of a page as ``before`` to get the
+        next one.
+        """
+        parsed = parse_query(query)
+        if not parsed:
+            return []
+        # Drive the scan with an exact term when there is one: its postings are
+        # already in seq order, so the scan stops after ``limit`` matches.
+        # Longer terms tend to be rarer.
+        exact = [p for p in parsed if not p[1]]
+        driver = max(exact or parsed, key=lambda p: len(p[0]))
+        parsed.remove(driver)
+
+        clause, params = _term_clause("p", *driver)
+        clauses = [clause]
+        if before is not None:
+            clauses.append("p.seq < ?")
+            params.append(before)
+        for i, (term, prefix) in enumerate(parsed):
+            clause, extra = _term_clause(f"q{i}", term, prefix)
+            clauses.append(f"EXISTS (SELECT 1 FROM postings q{i} WHERE q{i}.seq = p.seq AND {clause})")
+            params.extend(extra)
+        filters = [(column, value) for column, value in (("type", type), ("contributor", contributor))
+                   if value is not None]
+        if filters:
+            matches = " AND ".join(f"c.{column} = ?" for column, _ in filters)
+            clauses.append(f"EXISTS (SELECT 1 FROM contributions c WHERE c.seq = p.seq AND {matches})")
+            params.extend(value for _, value in filters)
+        distinct = "DISTINCT " if driver[1] else ""
+        params.append(limit)
+
+        conn = self.store.connection()
+        seqs = [
+            seq for (seq,) in conn.execute(
+                f"SELECT {distinct}p.seq FROM postings p WHERE {' AND '.join(clauses)} "
+                "ORDER BY p.seq DESC LIMIT ?",
+                params,
+            )
+        ]
+        if not seqs:
+            return []
+        rows = conn.execute(
+            f"SELECT seq, data FROM contributions WHERE seq IN ({', '.join('?' * len(seqs))}) "
+            "ORDER BY seq DESC",
+            seqs,
+        ).fetchall()
+        return [(seq, json.loads(data)) for seq, data in rows]
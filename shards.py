@@ -0,0 +1,162 @@
+"""Sharded, training-ready dataset export.
+
+Contributions are cut into size-bounded shards that training jobs can
+read in parallel:
+
+- ``tar``: WebDataset-style archives. Each contribution is a
+  ``<id>.json`` metadata member, followed by ``<id>.<ext>`` holding its
+  media blob when it has one.
+- ``parquet``: one Parquet file per shard, in fixed-size row groups.
+
+Records are streamed from the store on the calling thread and grouped
+into shards there. Each shard is written by a process pool, so packing
+and hashing use every core. A ``manifest.json`` next to the shards lists
+each shard's record count, size and SHA-256.
+"""
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import tarfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+from blobs import BlobStore
+from exporter import EXPORT_COLUMNS, write_parquet
+
+SHARD_FORMATS = {"tar": "tar", "parquet": "parquet"}
+SHARD_RECORDS = 10_000
+SHARD_BYTES = 256 << 20
+ROW_GROUP_SIZE = 1000
+MANIFEST = "manifest.json"
+
+# Fields shards read to pack and size media, whichever columns are exported
+MEDIA_FIELDS = ["blob_sha256", "filename", "file_size"]
+
+
+def _estimated_size(record):
+    # Metadata plus media, close enough to keep tar shards near the byte limit
+    return len(json.dumps(record, ensure_ascii=False, default=str)) + int(record.get("file_size") or 0)
+
+
+def plan_shards(records, max_records=SHARD_RECORDS, max_bytes=SHARD_BYTES):
+    """Group ``records`` into lists bounded by ``max_records`` and (estimated) ``max_bytes``."""
+    shard, size = [], 0
+    for record in records:
+        record_size = _estimated_size(record)
+        if shard and (len(shard) >= max_records or size + record_size > max_bytes):
+            yield shard
+            shard, size = [], 0
+        shard.append(record)
+        size += record_size
+    if shard:
+        yield shard
+
+
+def _reproducible(info):
+    # Same records, same bytes: no local owners or modification times
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    info.mtime = 0
+    return info
+
+
+def write_tar_shard(path, records, columns, blob_root=None):
+    """Write one WebDataset shard; returns the number of referenced blobs that were missing."""
+    blobs = BlobStore(blob_root) if blob_root else None
+    missing = 0
+    with tarfile.open(path, "w") as tar:
+        for record in records:
+            key = record["id"]
+            meta = json.dumps({c: record[c] for c in columns if c in record}, ensure_ascii=False, default=str)
+            data = meta.encode("utf-8")
+            info = _reproducible(tarfile.TarInfo(f"{key}.json"))
+            info.size = len(data)
+            tar.addfile(info, fileobj=io.BytesIO(data))
+
+            digest = record.get("blob_sha256")
+            if not digest or blobs is None:
+                continue
+            if not blobs.exists(digest):
+                missing += 1
+                continue
+            extension = os.path.splitext(record.get("filename") or "")[1].lower() or ".bin"
+            tar.add(blobs.path(digest), arcname=f"{key}{extension}", filter=_reproducible)
+    return missing
+
+
+def write_parquet_shard(path, records, columns, blob_root=None):
+    with open(path, "wb") as out:
+        write_parquet(records, out, columns, chunk_size=ROW_GROUP_SIZE)
+    return 0
+
+
+SHARD_WRITERS = {"tar": write_tar_shard, "parquet": write_parquet_shard}
+
+
+def _sha256(path, chunk_size=1 << 20):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return hasher.hexdigest()
+            hasher.update(chunk)
+
+
+def write_shard(fmt, path, records, columns, blob_root=None):
+    """Write a single shard and describe it for the manifest (runs in a worker process)."""
+    missing = SHARD_WRITERS[fmt](path, records, columns, blob_root)
+    return {
+        "name": os.path.basename(path),
+        "records": len(records),
+        "bytes": os.path.getsize(path),
+        "sha256": _sha256(path),
+        "missing_blobs": missing,
+    }
+
+
+def write_shards(records, directory, fmt, columns=None, max_records=SHARD_RECORDS, max_bytes=SHARD_BYTES,
+                 blob_root=None, workers=None, progress=None):
+    """Write ``records`` as ``fmt`` shards under ``directory``; returns the manifest.
+
+    At most two shards per worker are held in memory waiting to be written.
+    ``progress(shards_done, records_done)`` is called as shards finish.
+    """
+    if fmt not in SHARD_WRITERS:
+        raise ValueError(f"Unsupported shard format {fmt!r}")
+    columns = columns or EXPORT_COLUMNS
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(directory, exist_ok=True)
+
+    futures = []
+    # Spawned workers don't inherit the server's threads, locks or database handles
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        for index, shard in enumerate(plan_shards(records, max_records, max_bytes)):
+            path = os.path.join(directory, f"shard-{index:06d}.{SHARD_FORMATS[fmt]}")
+            futures.append(pool.submit(write_shard, fmt, path, shard, columns, blob_root))
+            pending = [f for f in futures if not f.done()]
+            if len(pending) >= workers * 2:
+                wait(pending, return_when=FIRST_COMPLETED)
+            if progress is not None:
+                done = [f for f in futures if f.done()]
+                progress(len(done), sum(f.result()["records"] for f in done))
+        shards = [f.result() for f in futures]
+
+    manifest = {
+        "format": fmt,
+        "created": datetime.now().isoformat(),
+        "columns": columns,
+        "records": sum(s["records"] for s in shards),
+        "bytes": sum(s["bytes"] for s in shards),
+        "shards": shards,
+    }
+    tmp_path = os.path.join(directory, MANIFEST + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(directory, MANIFEST))
+    if progress is not None:
+        progress(len(shards), manifest["records"])
+    return manifest
@@ -0,0 +1,446 @@
+"""Durable storage for corpus contributions.
+
+Contributions are kept as JSON documents next to a few indexed columns
+(type, language, contributor, timestamp) so pages can look records up
+without scanning the whole history. ``contributor`` is the contributor's
+stable id; the name they display travels in the document as
+``contributor_name`` and is never filtered on.
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from itertools import islice
+
+from rollups import Rollups
+from search import SearchIndex
+from timeseries import TimeSeries
+
+DEFAULT_STORE_URL = "sqlite:" + os.path.join("data", "bhasha.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contributions (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    type TEXT NOT NULL,
+    language TEXT,
+    contributor TEXT,
+    timestamp TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_contributions_type ON contributions(type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_contributions_language ON contributions(language, timestamp);
+CREATE INDEX IF NOT EXISTS idx_contributions_contributor ON contributions(contributor, timestamp);
+CREATE INDEX IF NOT EXISTS idx_contributions_timestamp ON contributions(timestamp);
+CREATE INDEX IF NOT EXISTS idx_contributions_blob
+    ON contributions(json_extract(data, '$.blob_sha256')) WHERE type = 'image';
+"""
+
+# Columns that may be used as query filters or grouped on
+INDEXED_COLUMNS = ("type", "language", "contributor")
+
+# Field names allowed in a query projection
+_FIELD_NAME = re.compile(r"^\w+$")
+
+
+# One page of a keyset-paginated listing; pass ``next_cursor`` back as ``after``
+Page = namedtuple("Page", ["records", "next_cursor"])
+
+
+def contribution_language(contribution):
+    # Text pairs carry source/target languages instead of a single language
+    return contribution.get("language") or contribution.get("target_language")
+
+
+class ListenerError(Exception):
+    """Raised after a batch was committed when one of the store's listeners failed on it."""
+
+
+class ContributionStore(ABC):
+    """Interface shared by all storage backends."""
+
+    def __init__(self):
+        self.listeners = []
+        # Each committed batch takes a ticket while writes are still ordered,
+        # then waits its turn to be delivered, so listeners see batches in
+        # commit order without holding up the next commit
+        self._turns = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+
+    def add(self, contribution):
+        self.add_many([contribution])
+
+    @abstractmethod
+    def add_many(self, contributions):
+        ...
+
+    @abstractmethod
+    def get(self, contribution_id):
+        ...
+
+    @abstractmethod
+    def find_by_blob(self, digest):
+        """Return the image contribution referencing blob ``digest``, if any."""
+
+    @abstractmethod
+    def query(self, type=None, language=None, contributor=None, since=None, until=None,
+              limit=None, newest_first=False, fields=None):
+        """Yield matching contributions in timestamp order.
+
+        With ``fields``, each contribution is a new dict holding only those
+        of the fields it has; ``language`` is ``contribution_language()``.
+        """
+
+    @abstractmethod
+    def page(self, type=None, language=None, contributor=None, since=None, until=None,
+             limit=20, newest_first=True, after=None):
+        """Return a ``Page`` of up to ``limit`` contributions following cursor ``after``."""
+
+    @abstractmethod
+    def count(self, type=None, language=None, contributor=None, since=None, until=None):
+        ...
+
+    @abstractmethod
+    def count_by(self, column, type=None, language=None, contributor=None):
+        ...
+
+    @abstractmethod
+    def totals(self, contributor=None):
+        ...
+
+    @abstractmethod
+    def breakdown(self, dimension, contributor=None):
+        ...
+
+    @abstractmethod
+    def series(self, scope, name="", grain="day", since=None, until=None):
+        """Day, week or month buckets for the corpus or one contributor, team or language."""
+
+    @abstractmethod
+    def search(self, query, type=None, contributor=None, limit=20, before=None):
+        """Return ``(seq, contribution)`` matching ``query``, newest first."""
+
+    @abstractmethod
+    def entries(self, after_seq=0):
+        """Yield ``(seq, language, contribution)`` in insertion order."""
+
+    def subscribe(self, listener):
+        """Call ``listener(entries)`` after every committed batch of inserts.
+
+        Batches are delivered one at a time in commit order. If a listener
+        raises, ``add_many`` raises ``ListenerError`` once every listener has
+        run; the batch stays committed.
+        """
+        self.listeners.append(listener)
+
+    def follow(self, listener, batch_size=1000):
+        """Feed ``listener`` every stored entry, then every batch committed after.
+
+        Each entry reaches ``listener`` exactly once, in sequence order. The
+        stored entries are scanned without blocking writers: batches committed
+        during the scan are held back and handed over, less what the scan
+        already covered, once it ends.
+        """
+        lock = threading.Lock()
+        held = []
+        caught_up = False
+
+        def deliver(entries):
+            with lock:
+                if not caught_up:
+                    held.append(entries)
+                    return
+            listener(entries)
+
+        self.subscribe(deliver)
+        last_seq = 0
+        entries = self.entries()
+        while True:
+            batch = list(islice(entries, batch_size))
+            if not batch:
+                break
+            listener(batch)
+            last_seq = batch[-1][0]
+        with lock:
+            for entries in held:
+                fresh = [entry for entry in entries if entry[0] > last_seq]
+                if fresh:
+                    listener(fresh)
+            held.clear()
+            caught_up = True
+
+    def _take_ticket(self):
+        # Called under the backend's write lock, right after a commit
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        return ticket
+
+    def _notify(self, ticket, entries):
+        with self._turns:
+            self._turns.wait_for(lambda: self._serving == ticket)
+        # Every listener sees the batch even if an earlier one fails
+        errors = []
+        try:
+            for listener in list(self.listeners):
+                try:
+                    listener(entries)
+                except Exception as e:
+                    errors.append(e)
+        finally:
+            with self._turns:
+                self._serving += 1
+                self._turns.notify_all()
+        if errors:
+            raise ListenerError(f"{len(errors)} store listener(s) failed on a committed batch") from errors[0]
+
+    def close(self):
+        pass
+
+
+class SQLiteStore(ContributionStore):
+    """SQLite backend running in WAL mode with one connection per thread.
+
+    Indexers are objects with a ``table``, its ``schema`` and an
+    ``apply(conn, entries)`` method; they are updated inside the same
+    transaction as every insert, with ``entries`` holding
+    ``(seq, language, contribution)`` tuples. Rebuilding one replays the
+    stored entries through the same ``apply``.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self.indexers = []
+        conn = self.connection()
+        conn.executescript(SCHEMA)
+        self.rollups = self.register_indexer(Rollups(self))
+        self.search_index = self.register_indexer(SearchIndex(self))
+        self.timeseries = self.register_indexer(TimeSeries(self))
+
+    def register_indexer(self, indexer, rebuild=False):
+        """Add ``indexer``, backfilling it when its table is new or ``rebuild`` is set."""
+        conn = self.connection()
+        with self._write_lock, conn:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (indexer.table,)
+            ).fetchone()
+            conn.executescript(indexer.schema)
+            if rebuild or not exists:
+                self._rebuild(conn, indexer)
+        self.indexers.append(indexer)
+        return indexer
+
+    def _rebuild(self, conn, indexer, batch_size=1000):
+        # Empty the indexer's table and replay every stored entry into it,
+        # all in the caller's transaction
+        conn.execute(f"DELETE FROM {indexer.table}")
+        entries = self.entries()
+        while True:
+            batch = list(islice(entries, batch_size))
+            if not batch:
+                break
+            indexer.apply(conn, batch)
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def add_many(self, contributions):
+        if not contributions:
+            return
+        conn = self.connection()
+        with self._write_lock:
+            with conn:
+                entries = []
+                for c in contributions:
+                    language = contribution_language(c)
+                    cursor = conn.execute(
+                        "INSERT INTO contributions (id, type, language, contributor, timestamp, data) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            c["id"],
+                            c["type"],
+                            language,
+                            c.get("contributor"),
+                            c["timestamp"],
+                            json.dumps(c, ensure_ascii=False, default=str),
+                        ),
+                    )
+                    entries.append((cursor.lastrowid, language, c))
+                for indexer in self.indexers:
+                    indexer.apply(conn, entries)
+            ticket = self._take_ticket()
+        # Outside the write lock, so a slow listener never holds up other writers
+        self._notify(ticket, entries)
+
+    def get(self, contribution_id):
+        row = self.connection().execute(
+            "SELECT data FROM contributions WHERE id = ?", (contribution_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find_by_blob(self, digest):
+        row = self.connection().execute(
+            "SELECT data FROM contributions "
+            "WHERE type = 'image' AND json_extract(data, '$.blob_sha256') = ?",
+            (digest,),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _where(self, type=None, language=None, contributor=None, since=None, until=None):
+        clauses, params = [], []
+        for column, value in (("type", type), ("language", language), ("contributor", contributor)):
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                if not value:
+                    # An empty selection matches nothing
+                    clauses.append("0")
+                    continue
+                clauses.append(f"{column} IN ({', '.join('?' * len(value))})")
+                params.extend(value)
+            else:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query(self, type=None, language=None, contributor=None, since=None, until=None,
+              limit=None, newest_first=False, fields=None):
+        where, params = self._where(type, language, contributor, since, until)
+        order = "DESC" if newest_first else "ASC"
+        select = "data" if fields is None else self._projection(fields)
+        sql = f"SELECT {select} FROM contributions{where} ORDER BY timestamp {order}, seq {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        cursor = self.connection().execute(sql, params)
+        # Stream rows rather than materializing the whole result
+        while True:
+            rows = cursor.fetchmany(500)
+            if not rows:
+                break
+            for (data,) in rows:
+                if fields is None:
+                    yield json.loads(data)
+                else:
+                    yield {k: v for k, v in json.loads(data).items() if v is not None}
+
+    @staticmethod
+    def _projection(fields):
+        # Let SQLite pick the fields out, so large text fields that aren't
+        # needed are never decoded in Python
+        for field in fields:
+            if not _FIELD_NAME.match(field):
+                raise ValueError(f"Invalid field name {field!r}")
+        # "language" comes from the indexed column, which holds
+        # contribution_language(), so text pairs get their target language
+        pairs = ", ".join(f"'{f}', language" if f == "language" else f"'{f}', json_extract(data, '$.{f}')"
+                          for f in fields)
+        return f"json_object({pairs})"
+
+    def page(self, type=None, language=None, contributor=None, since=None, until=None,
+             limit=20, newest_first=True, after=None):
+        where, params = self._where(type, language, contributor, since, until)
+        order = "DESC" if newest_first else "ASC"
+        if after is not None:
+            # Seek past the previous page on the (timestamp, seq) index instead of using OFFSET
+            clause = f"(timestamp, seq) {'<' if newest_first else '>'} (?, ?)"
+            where = f"{where} AND {clause}" if where else f" WHERE {clause}"
+            params.extend(after)
+        # One extra row tells whether there is a next page
+        params.append(limit + 1)
+        rows = self.connection().execute(
+            f"SELECT seq, timestamp, data FROM contributions{where} "
+            f"ORDER BY timestamp {order}, seq {order} LIMIT ?",
+            params,
+        ).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1][1], rows[-1][0])
+        return Page([json.loads(data) for _seq, _timestamp, data in rows], next_cursor)
+
+    def entries(self, after_seq=0):
+        cursor = self.connection().execute(
+            "SELECT seq, language, data FROM contributions WHERE seq > ? ORDER BY seq", (after_seq,)
+        )
+        while True:
+            rows = cursor.fetchmany(500)
+            if not rows:
+                break
+            for seq, language, data in rows:
+                yield seq, language, json.loads(data)
+
+    def count(self, type=None, language=None, contributor=None, since=None, until=None):
+        where, params = self._where(type, language, contributor, since, until)
+        return self.connection().execute(
+            f"SELECT COUNT(*) FROM contributions{where}", params
+        ).fetchone()[0]
+
+    def count_by(self, column, type=None, language=None, contributor=None):
+        if column not in INDEXED_COLUMNS:
+            raise ValueError(f"Cannot group contributions by {column!r}")
+        where, params = self._where(type, language, contributor)
+        rows = self.connection().execute(
+            f"SELECT {column}, COUNT(*) FROM contributions{where} GROUP BY {column}", params
+        ).fetchall()
+        return {key if key is not None else "Unknown": n for key, n in rows}
+
+    def totals(self, contributor=None):
+        return self.rollups.totals(contributor)
+
+    def breakdown(self, dimension, contributor=None):
+        return self.rollups.breakdown(dimension, contributor)
+
+    def series(self, scope, name="", grain="day", since=None, until=None):
+        return self.timeseries.series(scope, name, grain, since, until)
+
+    def search(self, query, type=None, contributor=None, limit=20, before=None):
+        return self.search_index.search(query, type, contributor, limit, before)
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# Registered backends, selected by the scheme of the store URL
+BACKENDS = {
+    "sqlite": SQLiteStore,
+}
+
+
+def open_store(url=None):
+    """Open the store named by ``url`` (``<backend>:<location>``).
+
+    Falls back to the ``BHASHA_STORE`` environment variable and then to a
+    SQLite database under ``data/``.
+    """
+    url = url or os.environ.get("BHASHA_STORE", DEFAULT_STORE_URL)
+    backend, _, location = url.partition(":")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown contribution store backend {backend!r}")
+    return BACKENDS[backend](location)
@@ -0,0 +1,289 @@
+"""Script-aware text statistics for Indic and Latin text.
+
+Counts words, user-perceived characters (grapheme clusters) and the script
+mix of a text. Code points are classified through lookup tables built once
+per process, so a whole batch of texts is processed in a few NumPy passes
+rather than a Python loop per character.
+
+Grapheme clusters follow the extended grapheme cluster rules closely enough
+for Indic text: combining marks, joiners and variation selectors extend the
+previous cluster, and a consonant after a virama (the Unicode 15.1
+conjunct rule) stays in the same cluster.
+"""
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+# (first, last, script) code point ranges; anything else counts as "Common"
+SCRIPT_RANGES = [
+    (0x0041, 0x005A, "Latin"),
+    (0x0061, 0x007A, "Latin"),
+    (0x00C0, 0x024F, "Latin"),
+    (0x1E00, 0x1EFF, "Latin"),
+    (0x0900, 0x097F, "Devanagari"),
+    (0xA8E0, 0xA8FF, "Devanagari"),
+    (0x0980, 0x09FF, "Bengali"),
+    (0x0A00, 0x0A7F, "Gurmukhi"),
+    (0x0A80, 0x0AFF, "Gujarati"),
+    (0x0B00, 0x0B7F, "Oriya"),
+    (0x0B80, 0x0BFF, "Tamil"),
+    (0x0C00, 0x0C7F, "Telugu"),
+    (0x0C80, 0x0CFF, "Kannada"),
+    (0x0D00, 0x0D7F, "Malayalam"),
+]
+SCRIPTS = ["Common"] + sorted({script for _, _, script in SCRIPT_RANGES})
+
+# Viramas that join a following consonant into one cluster (InCB=Linker)
+LINKERS = {0x094D, 0x09CD, 0x0ACD, 0x0B4D, 0x0C4D, 0x0D4D}
+CONJUNCT_SCRIPTS = {"Devanagari", "Bengali", "Gujarati", "Oriya", "Telugu", "Malayalam"}
+ZWNJ, ZWJ = 0x200C, 0x200D
+
+# Table size: the BMP plus one slot standing in for every astral code point
+TABLE_SIZE = 0x10001
+
+WORD, EXTEND, LINKER, CONSONANT, PICTOGRAPHIC = 1, 2, 4, 8, 16
+
+TextStats = namedtuple("TextStats", ["words", "graphemes", "codepoints", "scripts"])
+
+# Script each contribution language is written in. Languages sharing a
+# script (Hindi and Marathi) can't be told apart this way.
+LANGUAGE_SCRIPTS = {
+    "Hindi": "Devanagari",
+    "Marathi": "Devanagari",
+    "Tamil": "Tamil",
+    "Telugu": "Telugu",
+    "Bengali": "Bengali",
+    "Gujarati": "Gujarati",
+    "Kannada": "Kannada",
+    "Malayalam": "Malayalam",
+    "English": "Latin",
+}
+
+# Share of a text's letters that must be in its language's script
+MIN_SCRIPT_SHARE = 0.6
+
+# (text field, language field) pairs checked on contributions
+SCRIPT_CHECKED_FIELDS = [
+    ("source_text", "source_language"),
+    ("target_text", "target_language"),
+    ("description", "language"),
+]
+
+# ``ok`` is True when the text has too few letters to judge or its language is unknown
+ScriptCheck = namedtuple("ScriptCheck", ["ok", "expected", "found", "share"])
+
+
+@lru_cache(maxsize=1)
+def _tables():
+    """Per-code-point script codes and class flags, built on first use."""
+    script = np.zeros(TABLE_SIZE, dtype=np.uint8)
+    for first, last, name in SCRIPT_RANGES:
+        script[first:last + 1] = SCRIPTS.index(name)
+
+    flags = np.zeros(TABLE_SIZE, dtype=np.uint8)
+    for cp in range(TABLE_SIZE - 1):
+        category = unicodedata.category(chr(cp))
+        if category[0] in "LMN":
+            flags[cp] |= WORD
+        if category[0] == "M":
+            flags[cp] |= EXTEND
+        if category == "Lo" and SCRIPTS[script[cp]] in CONJUNCT_SCRIPTS:
+            flags[cp] |= CONSONANT
+        if category == "So":
+            flags[cp] |= PICTOGRAPHIC
+    for cp in (ZWNJ, ZWJ):
+        flags[cp] |= WORD | EXTEND
+    flags[0xFE00:0xFE10] |= EXTEND
+    for cp in LINKERS:
+        flags[cp] |= LINKER
+    # Astral code points are mostly emoji and symbols
+    flags[TABLE_SIZE - 1] = PICTOGRAPHIC
+    return script, flags
+
+
+def _codepoints(text):
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+def text_stats_batch(texts):
+    """Return a ``TextStats`` per text, computed in one vectorized pass."""
+    texts = list(texts)
+    if not texts:
+        return []
+    script_table, flag_table = _tables()
+
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    ends = np.cumsum(lengths)
+    offsets = ends - lengths
+    cps = _codepoints("".join(texts))
+    index = np.minimum(cps, TABLE_SIZE - 1)
+    flags = flag_table[index]
+    scripts = script_table[index]
+
+    first = np.zeros(len(cps), dtype=bool)
+    first[offsets[lengths > 0]] = True
+
+    word = (flags & WORD) > 0
+    word_starts = _word_starts(word, scripts, first)
+
+    prev_flags = np.roll(flags, 1)
+    prev2_flags = np.roll(flags, 2)
+    prev_cp = np.roll(cps, 1)
+    # Conjuncts: consonant after a linker, optionally with a joiner in between
+    after_linker = ((prev_flags & LINKER) > 0) | ((prev_cp == ZWJ) & ((prev2_flags & LINKER) > 0))
+    joins = (
+        ((flags & EXTEND) > 0)
+        | (((flags & CONSONANT) > 0) & after_linker)
+        | (((flags & PICTOGRAPHIC) > 0) & (prev_cp == ZWJ))
+        | ((cps == 0x0A) & (prev_cp == 0x0D))
+        # Emoji skin tone modifiers
+        | ((cps >= 0x1F3FB) & (cps <= 0x1F3FF))
+    )
+    cluster_starts = ~joins | first
+
+    def per_text(mask):
+        totals = np.concatenate(([0], np.cumsum(mask, dtype=np.int64)))
+        return totals[ends] - totals[offsets]
+
+    words = per_text(word_starts)
+    graphemes = per_text(cluster_starts)
+
+    histogram = _script_histogram(lengths, scripts, word)
+
+    return [
+        TextStats(
+            int(words[i]),
+            int(graphemes[i]),
+            int(lengths[i]),
+            {SCRIPTS[s]: int(n) for s, n in enumerate(histogram[i]) if n},
+        )
+        for i in range(len(texts))
+    ]
+
+
+def _script_histogram(lengths, scripts, word):
+    # Script histogram over letters only, one row per text
+    text_ids = np.repeat(np.arange(len(lengths)), lengths)
+    letters = word & (scripts > 0)
+    return np.bincount(
+        text_ids[letters] * len(SCRIPTS) + scripts[letters],
+        minlength=len(lengths) * len(SCRIPTS),
+    ).reshape(len(lengths), len(SCRIPTS))
+
+
+def check_scripts(texts, languages, min_share=MIN_SCRIPT_SHARE):
+    """Return a ``ScriptCheck`` per text, telling whether it is written in its language's script.
+
+    ``languages`` runs parallel to ``texts``. The whole batch is classified
+    in one pass of table lookups and a single histogram.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    script_table, flag_table = _tables()
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    index = np.minimum(_codepoints("".join(texts)), TABLE_SIZE - 1)
+    histogram = _script_histogram(lengths, script_table[index], (flag_table[index] & WORD) > 0)
+
+    expected = np.array([SCRIPTS.index(LANGUAGE_SCRIPTS[lang]) if lang in LANGUAGE_SCRIPTS else 0
+                         for lang in languages], dtype=np.int64)
+    letters = histogram.sum(axis=1)
+    found = histogram.argmax(axis=1)
+    share = histogram[np.arange(len(texts)), expected] / np.maximum(letters, 1)
+    ok = (letters == 0) | (expected == 0) | (share >= min_share)
+    return [
+        ScriptCheck(
+            bool(ok[i]),
+            SCRIPTS[expected[i]] if expected[i] else None,
+            SCRIPTS[found[i]] if letters[i] else None,
+            float(share[i]),
+        )
+        for i in range(len(texts))
+    ]
+
+
+def script_mismatches(contributions, batch_size=10000):
+    """Yield ``(contribution, field, ScriptCheck)`` for text not in its language's script.
+
+    Streams ``contributions`` (e.g. a store query) and checks each batch
+    of them in one call, so a whole corpus can be audited.
+    """
+    contributions = iter(contributions)
+    while True:
+        batch = []
+        for contribution in contributions:
+            batch.append(contribution)
+            if len(batch) >= batch_size:
+                break
+        if not batch:
+            return
+        items = [(c, text_field, c.get(lang_field)) for c in batch
+                 for text_field, lang_field in SCRIPT_CHECKED_FIELDS if c.get(text_field)]
+        checks = check_scripts([c[field] for c, field, _ in items], [lang for _, _, lang in items])
+        for (contribution, field, _), check in zip(items, checks):
+            if not check.ok:
+                yield contribution, field, check
+
+
+def _word_starts(word, scripts, first):
+    # A token is a run of letters, marks and digits; a change of script
+    # inside the run (code-mixed text without spaces) starts a new one
+    prev_script = np.roll(scripts, 1)
+    switch = (scripts > 0) & (prev_script > 0) & (scripts != prev_script)
+    return word & (~np.roll(word, 1) | switch | first)
+
+
+def words_batch(texts):
+    """Split each of ``texts`` into word tokens, in one vectorized pass.
+
+    Tokens break exactly where ``text_stats_batch`` counts words, so Indic
+    vowel signs and viramas stay inside their word and a change of script
+    starts a new token.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    script_table, flag_table = _tables()
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    ends = np.cumsum(lengths)
+    offsets = ends - lengths
+    joined = "".join(texts)
+    if not joined:
+        return [[] for _ in texts]
+    index = np.minimum(_codepoints(joined), TABLE_SIZE - 1)
+    word = (flag_table[index] & WORD) > 0
+
+    nonempty = lengths > 0
+    first = np.zeros(len(joined), dtype=bool)
+    first[offsets[nonempty]] = True
+    last = np.zeros(len(joined), dtype=bool)
+    last[ends[nonempty] - 1] = True
+
+    starts = _word_starts(word, script_table[index], first)
+    stops = word & (~np.roll(word, -1) | np.roll(starts, -1) | last)
+    start_at, stop_at = np.flatnonzero(starts), np.flatnonzero(stops)
+    tokens = [joined[a:b + 1] for a, b in zip(start_at.tolist(), stop_at.tolist())]
+    # Hand each text the run of tokens that starts inside it
+    bounds = np.searchsorted(start_at, np.append(offsets, len(joined))).tolist()
+    return [tokens[bounds[i]:bounds[i + 1]] for i in range(len(texts))]
+
+
+def words(text):
+    """Split ``text`` into word tokens (see ``words_batch``)."""
+    if not text:
+        return []
+    return words_batch([text])[0]
+
+
+@lru_cache(maxsize=4096)
+def text_stats(text):
+    """Cached ``TextStats`` for a single text."""
+    return text_stats_batch([text])[0]
+
+
+def dominant_script(stats):
+    if not stats.scripts:
+        return None
+    return max(stats.scripts, key=stats.scripts.get)
@@ -0,0 +1,128 @@
+"""Time-bucketed counters maintained alongside the contribution store.
+
+Each contribution is counted into day, week and month buckets for the
+corpus and for its contributor, team and language, in the same
+transaction as the insert. Charts read a contiguous range of buckets
+instead of rescanning history.
+"""
+from collections import namedtuple
+from datetime import date, timedelta
+
+from catalog import AUDIO_QUALITIES
+
+GRAINS = ("day", "week", "month")
+SCOPES = ("corpus", "contributor", "team", "language")
+
+# ``scored`` counts the records that have a quality score, so the average
+# is ``quality / scored``
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series_counters (
+    scope TEXT NOT NULL,
+    name TEXT NOT NULL,
+    grain TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    records INTEGER NOT NULL DEFAULT 0,
+    hours REAL NOT NULL DEFAULT 0,
+    words INTEGER NOT NULL DEFAULT 0,
+    quality REAL NOT NULL DEFAULT 0,
+    scored INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, name, grain, bucket)
+) WITHOUT ROWID;
+"""
+
+Bucket = namedtuple("Bucket", ["records", "hours", "words", "quality", "scored"])
+EMPTY_BUCKET = Bucket(0, 0.0, 0, 0.0, 0)
+
+# Scores for the catalog's audio quality labels, best first
+AUDIO_QUALITY = dict(zip(AUDIO_QUALITIES, (1.0, 0.8, 0.6)))
+
+
+def quality(contribution):
+    """Heuristic 0-1 quality of a contribution from the metadata it carries.
+
+    Audio uses its recording quality; text pairs and images earn credit for
+    the optional context fields contributors fill in. Video carries nothing
+    to judge it by, so it gets no score (``None``) and stays out of averages.
+    """
+    kind = contribution["type"]
+    if kind == "audio":
+        return AUDIO_QUALITY.get(contribution.get("quality"), min(AUDIO_QUALITY.values()))
+    if kind == "text":
+        return 0.7 + (0.3 if contribution.get("context") else 0.0)
+    if kind == "image":
+        return (0.7 + (0.15 if contribution.get("cultural_significance") else 0.0)
+                + (0.15 if contribution.get("tags") else 0.0))
+    return None
+
+
+def bucket_key(grain, day):
+    """Bucket of ``day`` (a date): the day itself, the Monday of its week, or ``YYYY-MM``."""
+    if grain == "day":
+        return day.isoformat()
+    if grain == "week":
+        return (day - timedelta(days=day.weekday())).isoformat()
+    return day.isoformat()[:7]
+
+
+def series_keys(language, contribution):
+    """Yield the (scope, name, grain, bucket) counters one contribution feeds."""
+    day = date.fromisoformat(contribution["timestamp"][:10])
+    scopes = [("corpus", ""), ("contributor", contribution.get("contributor")),
+              ("team", contribution.get("team")), ("language", language)]
+    for grain in GRAINS:
+        bucket = bucket_key(grain, day)
+        for scope, name in scopes:
+            if name is not None:
+                yield scope, name, grain, bucket
+
+
+class TimeSeries:
+    """Counters kept in the ``series_counters`` table of a SQLite store."""
+
+    table = "series_counters"
+    schema = SCHEMA
+
+    def __init__(self, store):
+        self.store = store
+
+    def apply(self, conn, entries):
+        deltas = {}
+        for _seq, language, contribution in entries:
+            hours = float(contribution.get("duration_hours") or 0)
+            words = int(contribution.get("word_count") or 0)
+            score = quality(contribution)
+            for key in series_keys(language, contribution):
+                records, h, w, q, scored = deltas.get(key, EMPTY_BUCKET)
+                if score is not None:
+                    q, scored = q + score, scored + 1
+                deltas[key] = Bucket(records + 1, h + hours, w + words, q, scored)
+        conn.executemany(
+            "INSERT INTO series_counters (scope, name, grain, bucket, records, hours, words, quality, scored) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (scope, name, grain, bucket) DO UPDATE SET "
+            "records = records + excluded.records, "
+            "hours = hours + excluded.hours, "
+            "words = words + excluded.words, "
+            "quality = quality + excluded.quality, "
+            "scored = scored + excluded.scored",
+            [key + tuple(delta) for key, delta in deltas.items()],
+        )
+
+    def series(self, scope, name="", grain="day", since=None, until=None):
+        """Return ``{bucket: Bucket}`` for the non-empty buckets between ``since`` and ``until``.
+
+        ``since`` and ``until`` are dates; both are inclusive.
+        """
+        if scope not in SCOPES or grain not in GRAINS:
+            raise ValueError(f"Unknown series {scope}/{grain}")
+        sql = ("SELECT bucket, records, hours, words, quality, scored FROM series_counters "
+               "WHERE scope = ? AND name = ? AND grain = ?")
+        params = [scope, name or "", grain]
+        if since is not None:
+            sql += " AND bucket >= ?"
+            params.append(bucket_key(grain, since))
+        if until is not None:
+            sql += " AND bucket <= ?"
+            params.append(bucket_key(grain, until))
+        rows = self.store.connection().execute(sql + " ORDER BY bucket", params).fetchall()
+        return {bucket: Bucket(*values) for bucket, *values in rows}
@@ -0,0 +1,136 @@
+"""Group commits for contributions submitted by many sessions.
+
+Every Streamlit session runs on its own thread. Instead of each of them
+opening a transaction and waiting on the store's write lock, submissions
+go onto one bounded queue. A single writer thread takes whatever has piled
+up, up to ``max_batch`` contributions, and commits it as one batch, so a
+burst of submissions costs one transaction instead of one each. (The store
+runs WAL with ``synchronous=NORMAL``, so a commit is a WAL append, not an
+fsync; the WAL is synced at checkpoints.)
+
+The writer never waits for more submissions to arrive: a lone submission
+is committed straight away, and batches form from the ones that queue up
+while the previous commit is running. Submitters wait up to ``timeout``
+seconds in all: they get ``WriteQueueFull`` if the queue has no room in
+that time, and ``WriteTimeout`` if their contribution is queued but not
+yet committed.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+
+from store import ListenerError
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteQueueFull(Exception):
+    """Raised when the write queue stays full for the whole timeout."""
+
+
+class WriteTimeout(Exception):
+    """Raised when a queued contribution isn't committed within the timeout.
+
+    It stays queued and is still committed once the writer gets to it.
+    """
+
+
+class WriteQueue:
+    def __init__(self, store, max_batch=500, max_pending=10000):
+        self.store = store
+        self.max_batch = max_batch
+        self.batches = 0
+        self.committed = 0
+        self._queue = queue.Queue(max_pending)
+        self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+        self._thread.start()
+
+    def submit(self, contribution, timeout=5):
+        """Queue ``contribution``; the returned future resolves once it is committed."""
+        future = Future()
+        try:
+            self._queue.put((contribution, future), timeout=timeout)
+        except queue.Full:
+            raise WriteQueueFull("Too many contributions are waiting to be saved") from None
+        return future
+
+    def add(self, contribution, timeout=5):
+        """Queue ``contribution`` and wait until it is committed."""
+        self.add_many([contribution], timeout)
+
+    def add_many(self, contributions, timeout=5):
+        deadline = time.monotonic() + timeout
+        futures = [self.submit(c, max(0, deadline - time.monotonic())) for c in contributions]
+        try:
+            for future in futures:
+                future.result(max(0, deadline - time.monotonic()))
+        except TimeoutError:
+            raise WriteTimeout("Contributions are still waiting to be saved") from None
+
+    def get(self, contribution_id):
+        # Reads go straight to the store
+        return self.store.get(contribution_id)
+
+    def __len__(self):
+        return self._queue.qsize()
+
+    def _collect(self):
+        item = self._queue.get()
+        if item is _STOP:
+            return None
+        batch = [item]
+        # Take only what is already queued; waiting for more would just
+        # delay submitters that are blocked on their futures
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Commit what we have, then stop on the next round
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _commit(self, contributions):
+        """Commit ``contributions``, raising only if the transaction itself failed."""
+        try:
+            self.store.add_many(contributions)
+        except ListenerError:
+            # The rows are committed and must not be retried; only an
+            # in-memory view missed them
+            logger.exception("A store listener failed on a committed batch")
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            try:
+                self._commit([c for c, _ in batch])
+            except Exception:
+                # One bad contribution (e.g. a duplicate id) aborts the whole
+                # transaction, so retry them one by one to isolate it
+                for contribution, future in batch:
+                    try:
+                        self._commit([contribution])
+                    except Exception as e:
+                        future.set_exception(e)
+                    else:
+                        self.committed += 1
+                        future.set_result(None)
+            else:
+                self.committed += len(batch)
+                for _, future in batch:
+                    future.set_result(None)
+            self.batches += 1
+
+    def close(self, timeout=None):
+        """Commit everything queued so far and stop the writer thread."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)